@@ -0,0 +1,4 @@
+from pathlib import Path
+
+project_root_dir = Path(__file__).parent.joinpath('..').resolve()
+build_dir = project_root_dir.joinpath('build')
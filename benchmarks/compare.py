@@ -0,0 +1,46 @@
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _load_results(file_path: Path) -> dict[tuple[int, int], dict[str, float]]:
+    report = json.loads(file_path.read_text('utf-8'))
+    return {(result['glyphs_count'], result['size']): result for result in report['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compares two benchmark results written by benchmarks.run.')
+    parser.add_argument('base', type=Path, help='the results to compare against')
+    parser.add_argument('head', type=Path, help='the new results')
+    parser.add_argument('--threshold', type=float, default=1.1, help='the ratio above which a metric has regressed')
+    args = parser.parse_args()
+
+    base_results = _load_results(args.base)
+    head_results = _load_results(args.head)
+    regressions = 0
+    for case, head_result in head_results.items():
+        base_result = base_results.get(case)
+        if base_result is None:
+            continue
+        glyphs_count, size = case
+        print(f'{glyphs_count} glyphs {size}px')
+        for key, head_value in head_result.items():
+            if not (key.endswith('_seconds') or key.endswith('_bytes')) or key == 'file_bytes':
+                continue
+            base_value = base_result.get(key)
+            if not base_value:
+                continue
+            ratio = head_value / base_value
+            marker = ''
+            if ratio > args.threshold:
+                marker = '  <- regression'
+                regressions += 1
+            print(f'  {key:<28} {base_value:>14.6g} {head_value:>14.6g} {ratio:>7.2f}x{marker}')
+    if regressions > 0:
+        print(f'{regressions} regressions above {args.threshold:.2f}x')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
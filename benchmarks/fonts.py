@@ -0,0 +1,60 @@
+import random
+
+from bdffont import BdfFont, BdfGlyph
+
+
+def create_font(glyphs_count: int, size: int, seed: int = 0) -> BdfFont:
+    """
+    Creates a font with random bitmaps that is the same for the same arguments, on every platform and Python
+    version. About one glyph in twenty is blank and one in ten is half width, like the spaces and the Latin glyphs
+    of a CJK font.
+    """
+    rng = random.Random(f'{glyphs_count}-{size}-{seed}')
+    descent = size // 8
+    font = BdfFont(
+        point_size=size,
+        resolution=(75, 75),
+        bounding_box=(size, size, 0, -descent),
+    )
+    font.properties.foundry = 'Benchmark'
+    font.properties.family_name = f'Synthetic {size}'
+    font.properties.weight_name = 'Medium'
+    font.properties.slant = 'R'
+    font.properties.setwidth_name = 'Normal'
+    font.properties.pixel_size = size
+    font.properties.point_size = size * 10
+    font.properties.resolution_x = 75
+    font.properties.resolution_y = 75
+    font.properties.spacing = 'C'
+    font.properties.average_width = size * 10
+    font.properties.charset_registry = 'ISO10646'
+    font.properties.charset_encoding = '1'
+    font.properties.default_char = 0
+    font.properties.font_ascent = size - descent
+    font.properties.font_descent = descent
+    font.generate_name_as_xlfd()
+
+    for encoding in range(glyphs_count):
+        kind = rng.random()
+        if kind < 0.05:
+            width = 0
+            height = 0
+        elif kind < 0.15:
+            width = size // 2
+            height = size
+        else:
+            width = size
+            height = size
+        stride = (width + 7) // 8
+        bitmap_data = b''.join([
+            (rng.getrandbits(width) << (stride * 8 - width)).to_bytes(stride, 'big') for _ in range(height)
+        ])
+        font.glyphs.append(BdfGlyph(
+            name=f'uni{encoding:04X}',
+            encoding=encoding,
+            scalable_width=(round(width * 1000 / size) if width > 0 else 500, 0),
+            device_width=(width if width > 0 else size // 2, 0),
+            bounding_box=(width, height, 0, -descent if height > 0 else 0),
+            bitmap_data=bitmap_data,
+        ))
+    return font
@@ -0,0 +1,263 @@
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from benchmarks import build_dir, project_root_dir
+from benchmarks.fonts import create_font
+from bdffont import BdfFont, BdfGlyph
+from bdffont.glyph import _decode_hex_bitmap, _encode_hex_bitmap, _unpack_bitmap
+
+
+def _measure_time(func: Callable[[], Any], repeat: int) -> float:
+    """
+    The best of several runs in seconds, which is the least disturbed by the rest of the system.
+    """
+    best = None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def _measure_memory(func: Callable[[], Any]) -> tuple[int, int]:
+    """
+    The peak of the memory allocated while running, and the memory still held by the result afterward, in bytes.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak, current
+
+
+def _access_properties(font: BdfFont):
+    for glyph in font.glyphs:
+        _ = glyph.scalable_width, glyph.device_width, glyph.bounding_box
+    properties = font.properties
+    for _ in range(1000):
+        _ = properties.font_ascent, properties.font_descent, properties.default_char, properties.pixel_size
+
+
+def _get_glyphs(font: BdfFont):
+    for encoding in range(len(font.glyphs)):
+        font.get_glyph(encoding)
+
+
+class _DictGlyph:
+    """
+    Holds the attributes of a glyph in an instance dict, with a comments list of its own, as glyphs did before
+    slots, to show the memory saved per glyph.
+    """
+
+    def __init__(self, glyph: BdfGlyph):
+        for key in BdfGlyph.__slots__:
+            if key != '__weakref__':
+                setattr(self, key, getattr(glyph, key))
+        self._comments = list(glyph._comments or [])
+
+
+def _copy_glyphs(font: BdfFont) -> list[BdfGlyph]:
+    return [
+        BdfGlyph(
+            glyph.name,
+            glyph.encoding,
+            glyph.scalable_width,
+            glyph.device_width,
+            glyph.bounding_box,
+            None,
+            glyph._comments,
+            glyph.bitmap_data,
+        ) for glyph in font.glyphs
+    ]
+
+
+def _create_labels(glyphs_count: int, labels_count: int = 1000, seed: int = 0) -> list[str]:
+    """
+    Creates short strings of the first few hundred characters of the font, like the labels of a user interface
+    that are drawn again and again.
+    """
+    rng = random.Random(f'{glyphs_count}-{seed}')
+    encodings = range(min(glyphs_count, 512))
+    return [''.join(map(chr, rng.choices(encodings, k=rng.randint(4, 32)))) for _ in range(labels_count)]
+
+
+def _render_labels(font: BdfFont, labels: list[str]):
+    for label in labels:
+        font.render_text(label)
+
+
+def _measure_labels(font: BdfFont, labels: list[str]):
+    for label in labels:
+        font.measure_text(label)
+
+
+def _get_hex_words(font: BdfFont) -> list[tuple[list[bytes], int]]:
+    return [
+        (_encode_hex_bitmap(glyph.bitmap_data, glyph.width).encode().split(), glyph.width)
+        for glyph in font.glyphs if glyph.height > 0
+    ]
+
+
+def _decode_rows(hex_words: list[tuple[list[bytes], int]]):
+    for words, width in hex_words:
+        _decode_hex_bitmap(words, width)
+
+
+def _decode_rows_by_chars(hex_words: list[tuple[list[bytes], int]]):
+    """
+    Decodes a row at a time through a binary string, as the parser did before the table-driven codec, to show the
+    speedup per row.
+    """
+    for words, width in hex_words:
+        _ = [[int(c) for c in f'{int(word, 16):0{len(word) * 4}b}'][:width] for word in words]
+
+
+def _encode_rows(font: BdfFont):
+    for glyph in font.glyphs:
+        _encode_hex_bitmap(glyph.bitmap_data, glyph.width)
+
+
+def _encode_rows_by_chars(bitmaps: list[tuple[list[list[int]], int]]):
+    """
+    Encodes a row at a time through a binary string, as the dump did before the table-driven codec.
+    """
+    for bitmap, width in bitmaps:
+        stride = (width + 7) // 8
+        padding = '0' * (stride * 8 - width)
+        _ = [format(int(''.join(map(str, row)) + padding, 2), f'0{stride * 2}X') for row in bitmap]
+
+
+def run_case(glyphs_count: int, size: int, repeat: int, outputs_dir: Path) -> dict[str, Any]:
+    font = create_font(glyphs_count, size)
+    data = font.dump_to_bytes()
+    file_path = outputs_dir.joinpath(f'synthetic-{glyphs_count}-{size}.bdf')
+    font.save(file_path)
+    parse_peak, font_size = _measure_memory(lambda: BdfFont.parse_bytes(data))
+    lazy_parse_peak, lazy_font_size = _measure_memory(lambda: BdfFont.parse_bytes(data, lazy=True))
+    hex_words = _get_hex_words(font)
+    bitmaps = [
+        (_unpack_bitmap(glyph.bitmap_data, glyph.width), glyph.width)
+        for glyph in font.glyphs if glyph.height > 0
+    ]
+    rows_count = sum(glyph.height for glyph in font.glyphs)
+    _, glyphs_size = _measure_memory(lambda: _copy_glyphs(font))
+    _, dict_glyphs_size = _measure_memory(lambda: [_DictGlyph(glyph) for glyph in font.glyphs])
+    labels = _create_labels(glyphs_count)
+    result = {
+        'glyphs_count': glyphs_count,
+        'size': size,
+        'file_bytes': len(data),
+        'parse_seconds': _measure_time(lambda: BdfFont.parse_bytes(data), repeat),
+        'parse_lazy_seconds': _measure_time(lambda: BdfFont.parse_bytes(data, lazy=True), repeat),
+        'dump_seconds': _measure_time(font.dump_to_bytes, repeat),
+        'load_seconds': _measure_time(lambda: BdfFont.load(file_path), repeat),
+        'load_mmap_seconds': _measure_time(lambda: BdfFont.load(file_path, mmap=True), repeat),
+        'save_seconds': _measure_time(lambda: font.save(file_path), repeat),
+        'property_access_seconds': _measure_time(lambda: _access_properties(font), repeat),
+        'get_glyph_seconds': _measure_time(lambda: _get_glyphs(font), repeat),
+        'render_text_seconds': _measure_time(lambda: _render_labels(font, labels), repeat) / len(labels),
+        'measure_text_seconds': _measure_time(lambda: _measure_labels(font, labels), repeat) / len(labels),
+        'decode_row_seconds': _measure_time(lambda: _decode_rows(hex_words), repeat) / rows_count,
+        'decode_row_by_chars_seconds': _measure_time(lambda: _decode_rows_by_chars(hex_words), repeat) / rows_count,
+        'encode_row_seconds': _measure_time(lambda: _encode_rows(font), repeat) / rows_count,
+        'encode_row_by_chars_seconds': _measure_time(lambda: _encode_rows_by_chars(bitmaps), repeat) / rows_count,
+        'parse_peak_bytes': parse_peak,
+        'font_bytes': font_size,
+        'parse_lazy_peak_bytes': lazy_parse_peak,
+        'lazy_font_bytes': lazy_font_size,
+        'glyph_bytes': glyphs_size / glyphs_count,
+        'glyph_dict_bytes': dict_glyphs_size / glyphs_count,
+    }
+    file_path.unlink()
+    return result
+
+
+def _get_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', 'HEAD'],
+            cwd=project_root_dir,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _parse_ints(value: str) -> list[int]:
+    return [int(token) for token in value.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measures BdfFont on synthetic fonts and writes the results as JSON.')
+    parser.add_argument(
+        '--counts',
+        type=_parse_ints,
+        default=[1000, 10000, 100000],
+        help='glyph counts, comma separated',
+    )
+    parser.add_argument('--sizes', type=_parse_ints, default=[8, 16, 32], help='pixel sizes, comma separated')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each timing, of which the best is kept')
+    parser.add_argument(
+        '--output',
+        type=Path,
+        default=build_dir.joinpath('benchmarks', 'results.json'),
+        help='the JSON file to write',
+    )
+    args = parser.parse_args()
+
+    outputs_dir = args.output.parent
+    outputs_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for glyphs_count in args.counts:
+        for size in args.sizes:
+            result = run_case(glyphs_count, size, args.repeat, outputs_dir)
+            results.append(result)
+            print(
+                f'{glyphs_count:>7} glyphs {size:>3}px: '
+                f'parse {result["parse_seconds"]:.3f}s, '
+                f'dump {result["dump_seconds"]:.3f}s, '
+                f'load {result["load_seconds"]:.3f}s, '
+                f'save {result["save_seconds"]:.3f}s, '
+                f'render {1 / result["render_text_seconds"]:.0f} strings/s, '
+                f'row codec {result["decode_row_by_chars_seconds"] / result["decode_row_seconds"]:.0f}x/'
+                f'{result["encode_row_by_chars_seconds"] / result["encode_row_seconds"]:.0f}x, '
+                f'peak {result["parse_peak_bytes"] / 1024 / 1024:.1f}MiB',
+                flush=True,
+            )
+
+    report = {
+        'commit': _get_commit(),
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'repeat': args.repeat,
+        'results': results,
+    }
+    args.output.write_text(json.dumps(report, indent=2) + '\n', 'utf-8')
+    print(f'results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,10 @@
+from bdffont.atlas import BdfAtlas, BdfAtlasGlyph
+from bdffont.batch import load_many
 from bdffont.font import BdfFont
 from bdffont.glyph import BdfGlyph
+from bdffont.pcf import PcfReader
+from bdffont.pool import BdfBitmapPool
 from bdffont.properties import BdfProperties
+from bdffont.render import BdfTextRenderer
+from bdffont.stats import BdfStats
+from bdffont.stream import BdfGlyphIterator, BdfWriter, iter_glyphs, load_header, subset
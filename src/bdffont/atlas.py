@@ -0,0 +1,126 @@
+from collections.abc import Iterable
+
+from bdffont.glyph import BdfGlyph
+
+# Maps the digits of a binary string to alpha values.
+_DIGITS_TO_ALPHA = bytes.maketrans(b'01', b'\x00\xFF')
+
+
+class BdfAtlasGlyph:
+    x: int
+    y: int
+    width: int
+    height: int
+    offset_x: int
+    offset_y: int
+    device_width_x: int
+    device_width_y: int
+    uv: tuple[float, float, float, float]
+
+    def __init__(
+            self,
+            position: tuple[int, int],
+            bounding_box: tuple[int, int, int, int],
+            device_width: tuple[int, int],
+    ):
+        """
+        :param position:
+            The x and y of the top left corner of the bitmap in the atlas.
+        :param bounding_box:
+            The bounding box of the glyph, the same as in 'BdfGlyph'.
+        :param device_width:
+            The device width of the glyph, the same as in 'BdfGlyph'.
+        """
+        self.x, self.y = position
+        self.width, self.height, self.offset_x, self.offset_y = bounding_box
+        self.device_width_x, self.device_width_y = device_width
+        self.uv = 0.0, 0.0, 0.0, 0.0
+
+
+class BdfAtlas:
+    width: int
+    height: int
+    pixels: bytes
+    glyphs: dict[int, BdfAtlasGlyph]
+
+    def __init__(
+            self,
+            width: int,
+            height: int,
+            pixels: bytes,
+            glyphs: dict[int, BdfAtlasGlyph],
+    ):
+        """
+        :param width:
+            The width of the atlas in pixels.
+        :param height:
+            The height of the atlas in pixels.
+        :param pixels:
+            The alpha of each pixel, one byte per pixel row by row, 255 where the bitmap is set and 0 elsewhere.
+        :param glyphs:
+            The place and metrics of each glyph by encoding.
+        """
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+        self.glyphs = glyphs
+
+    def get_pixel(self, x: int, y: int) -> int:
+        return self.pixels[y * self.width + x]
+
+
+def _build_atlas(glyphs: Iterable[BdfGlyph], max_width: int, padding: int) -> BdfAtlas:
+    """
+    Packs the bitmaps on shelves, tallest first. Identical bitmaps are placed once and shared.
+    """
+    entries = {}
+    places = {}
+    for glyph in glyphs:
+        if glyph.encoding in entries:
+            continue
+        key = glyph.width, glyph.height, glyph.bitmap_data
+        if glyph.width > 0 and glyph.height > 0:
+            if glyph.width + padding * 2 > max_width:
+                raise ValueError(f'glyph {repr(glyph.name)} is wider than the atlas: {glyph.width}')
+            places.setdefault(key, None)
+        entries[glyph.encoding] = key, glyph.bounding_box, glyph.device_width
+
+    x = padding
+    y = padding
+    shelf_height = 0
+    for key in sorted(places, key=lambda key: (-key[1], -key[0])):
+        width, height, _ = key
+        if x + width + padding > max_width:
+            x = padding
+            y += shelf_height + padding
+            shelf_height = 0
+        places[key] = x, y
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+    atlas_width = max_width
+    atlas_height = y + shelf_height + padding if shelf_height > 0 else 0
+
+    pixels = bytearray(atlas_width * atlas_height)
+    for (width, height, bitmap_data), (x, y) in places.items():
+        stride = (width + 7) // 8
+        bitmap_width = stride * 8
+        bits = format(int.from_bytes(bitmap_data, 'big'), f'0{len(bitmap_data) * 8}b')
+        bits = bits.encode().translate(_DIGITS_TO_ALPHA)
+        start = y * atlas_width + x
+        for row in range(min(height, len(bitmap_data) // stride)):
+            pixels[start:start + width] = bits[row * bitmap_width:row * bitmap_width + width]
+            start += atlas_width
+
+    atlas_glyphs = {}
+    for encoding, (key, bounding_box, device_width) in entries.items():
+        position = places.get(key, (0, 0))
+        atlas_glyph = BdfAtlasGlyph(position, bounding_box, device_width)
+        if atlas_height > 0:
+            atlas_glyph.uv = (
+                atlas_glyph.x / atlas_width,
+                atlas_glyph.y / atlas_height,
+                (atlas_glyph.x + atlas_glyph.width) / atlas_width,
+                (atlas_glyph.y + atlas_glyph.height) / atlas_height,
+            )
+        atlas_glyphs[encoding] = atlas_glyph
+    return BdfAtlas(atlas_width, atlas_height, bytes(pixels), atlas_glyphs)
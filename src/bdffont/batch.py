@@ -0,0 +1,43 @@
+import os
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from os import PathLike
+
+from bdffont.font import BdfFont, _pack_font, _unpack_font
+from bdffont.pool import BdfBitmapPool
+
+
+def _load_packed(file_path: str) -> bytes:
+    return _pack_font(BdfFont.load(file_path))
+
+
+def load_many(
+        file_paths: Iterable[str | PathLike[str]],
+        workers: int | None = None,
+        bitmap_pool: BdfBitmapPool | None = None,
+) -> Iterator[tuple[str | PathLike[str], BdfFont | Exception]]:
+    """
+    Loads the fonts in a pool of processes, and yields each path with its font, or with the error raised while
+    loading it, in the order they finish.
+
+    :param file_paths:
+        The paths of the font files.
+    :param workers:
+        The number of processes. Defaults to the number of CPUs.
+    :param bitmap_pool:
+        Share identical bitmaps across the fonts through this pool.
+    """
+    executor = ProcessPoolExecutor(workers)
+    try:
+        futures = {executor.submit(_load_packed, os.fspath(file_path)): file_path for file_path in file_paths}
+        for future in as_completed(futures):
+            try:
+                font = _unpack_font(future.result())
+            except Exception as e:
+                yield futures[future], e
+            else:
+                if bitmap_pool is not None:
+                    bitmap_pool.intern_glyphs(font.glyphs)
+                yield futures[future], font
+    finally:
+        executor.shutdown(cancel_futures=True)
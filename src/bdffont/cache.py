@@ -0,0 +1,97 @@
+import hashlib
+import marshal
+import os
+import secrets
+import zlib
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from os import PathLike
+from typing import BinaryIO, TypeVar
+
+_T = TypeVar('_T')
+
+_CACHE_MAGIC = b'BDFFONT-CACHE-1\n'
+
+# Binary on Windows, where 'os.open' would translate line breaks otherwise.
+_TEMP_FILE_FLAGS = os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, 'O_BINARY', 0)
+
+
+@contextmanager
+def _replace_file(file_path: str | PathLike[str]) -> Iterator[BinaryIO]:
+    """
+    Opens a temporary file next to the target, which replaces the target once written in full. The temporary file
+    is created like any new file, so it gets the mode of the umask, or takes the mode of the target if there is one.
+    Nothing is left behind on failure.
+    """
+    file_path = os.fspath(file_path)
+    directory, name = os.path.split(os.path.abspath(file_path))
+    while True:
+        temp_path = os.path.join(directory, f'{name}.{secrets.token_hex(8)}.tmp')
+        try:
+            fd = os.open(temp_path, _TEMP_FILE_FLAGS, 0o666)
+            break
+        except FileExistsError:
+            continue
+    try:
+        with os.fdopen(fd, 'wb') as file:
+            yield file
+        try:
+            os.chmod(temp_path, os.stat(file_path).st_mode & 0o7777)
+        except FileNotFoundError:
+            pass
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _get_cache_path(cache_dir: str | PathLike[str], file_path: str) -> str:
+    return os.path.join(cache_dir, f'{hashlib.sha256(file_path.encode()).hexdigest()}.cache')
+
+
+def _get_cache_key(file_path: str, cache_hash: bool) -> tuple[str, int, int, str | None]:
+    stat = os.stat(file_path)
+    if cache_hash:
+        with open(file_path, 'rb') as file:
+            content_hash = hashlib.sha256(file.read()).hexdigest()
+    else:
+        content_hash = None
+    return file_path, stat.st_size, stat.st_mtime_ns, content_hash
+
+
+def _read_cache(
+        cache_path: str,
+        cache_key: tuple[str, int, int, str | None],
+        unpack: Callable[[bytes], _T],
+) -> _T | None:
+    """
+    Returns 'None' if the snapshot is missing, stale or damaged.
+    """
+    try:
+        with open(cache_path, 'rb') as file:
+            data = file.read()
+    except OSError:
+        return None
+    if not data.startswith(_CACHE_MAGIC):
+        return None
+    try:
+        key, checksum, payload = marshal.loads(memoryview(data)[len(_CACHE_MAGIC):])
+        if key != cache_key or checksum != zlib.crc32(payload):
+            return None
+        return unpack(payload)
+    except Exception:
+        return None
+
+
+def _write_cache(cache_path: str, cache_key: tuple[str, int, int, str | None], payload: bytes):
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        with _replace_file(cache_path) as file:
+            file.write(_CACHE_MAGIC)
+            marshal.dump((cache_key, zlib.crc32(payload), payload), file)
+    except OSError:
+        # The cache is only an optimization, so failing to write it is not an error.
+        pass
@@ -1,13 +1,28 @@
-import math
+import marshal
+import mmap
+import os
 import re
-from collections.abc import Iterator
+from time import perf_counter
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from io import StringIO
+from itertools import repeat
 from os import PathLike
-from typing import Any, TextIO
+from typing import TYPE_CHECKING, Any, TextIO, BinaryIO
 
+from bdffont.atlas import BdfAtlas, _build_atlas
+from bdffont.cache import _get_cache_key, _get_cache_path, _read_cache, _replace_file, _write_cache
 from bdffont.error import BdfParseError, BdfMissingWordError, BdfIllegalWordError, BdfCountError, BdfDumpError
-from bdffont.glyph import BdfGlyph
-from bdffont.properties import BdfProperties
+from bdffont.glyph import (BdfGlyph, BdfGlyphList, _GlyphMetrics, _decode_hex_bitmap, _encode_hex_bitmap, _pack_glyphs,
+                           _unpack_glyphs)
+from bdffont.pcf import PcfReader, _dump_pcf
+from bdffont.pool import BdfBitmapPool
+from bdffont.properties import BdfProperties, _KEY_AVERAGE_WIDTH, _KEY_FONT_ASCENT, _KEY_FONT_DESCENT, _KEY_SPACING
+from bdffont.render import BdfTextRenderer
+from bdffont.stats import BdfStats
+
+if TYPE_CHECKING:
+    import numpy as np
 
 _SPEC_VERSION = '2.1'
 
@@ -28,25 +43,172 @@ _WORD_DWIDTH = 'DWIDTH'
 _WORD_BBX = 'BBX'
 _WORD_BITMAP = 'BITMAP'
 
+_KEYWORDS = {word.encode(): word for word in [
+    _WORD_STARTFONT,
+    _WORD_ENDFONT,
+    _WORD_COMMENT,
+    _WORD_FONT,
+    _WORD_SIZE,
+    _WORD_FONTBOUNDINGBOX,
+    _WORD_STARTPROPERTIES,
+    _WORD_ENDPROPERTIES,
+    _WORD_CHARS,
+    _WORD_STARTCHAR,
+    _WORD_ENDCHAR,
+    _WORD_ENCODING,
+    _WORD_SWIDTH,
+    _WORD_DWIDTH,
+    _WORD_BBX,
+    _WORD_BITMAP,
+]}
+
+_GLYPH_METRICS_WORDS = [
+    _WORD_ENCODING,
+    _WORD_SWIDTH,
+    _WORD_DWIDTH,
+    _WORD_BBX,
+]
+
+_FONT_METRICS_WORDS = [
+    _WORD_FONT,
+    _WORD_SIZE,
+    _WORD_FONTBOUNDINGBOX,
+    _WORD_CHARS,
+]
+
 
-def _create_lines_iterator(stream: TextIO) -> Iterator[tuple[str, str]]:
+_Lines = Iterator[tuple[str | bytes, str | bytes]]
+
+_LONE_CR_PATTERN = re.compile(rb'\r(?!\n)')
+
+
+def _create_lines_iterator(stream: Iterable[str]) -> Iterator[tuple[str, str]]:
     for line in stream:
         line = line.strip()
-        if line == '':
+        if ' ' in line:
+            word, _, tail = line.partition(' ')
+            yield word, tail.lstrip(' ')
+        elif line != '':
+            yield line, ''
+
+
+def _create_bytes_lines_iterator(stream: Iterable[bytes]) -> Iterator[tuple[str | bytes, bytes]]:
+    for line in stream:
+        if b'\r' in line and b'\r' in line.rstrip(b'\r\n'):
+            # Binary streams only break lines at LF, so the lines of a file with lone CRs are split here.
+            yield from _create_bytes_lines_iterator(line.splitlines())
             continue
-        tokens = re.split(r' +', line, 1)
-        word = tokens[0]
-        tail = tokens[1] if len(tokens) >= 2 else ''
-        yield word, tail
+        line = line.strip()
+        if b' ' in line:
+            word, _, tail = line.partition(b' ')
+            yield _KEYWORDS.get(word, word), tail.lstrip(b' ')
+        elif line != b'':
+            yield _KEYWORDS.get(line, line), b''
+
 
+class _BufferLines:
+    """
+    Tokenizes the lines of a bytes-like buffer. Keywords are yielded as 'str', everything else is kept as 'bytes'
+    and decoded only where it is text.
+    """
 
-def _convert_tail_to_ints(tail: str) -> list[int]:
-    tokens = re.split(r' +', tail)
-    values = [int(token) for token in tokens]
-    return values
+    buffer: bytes | mmap.mmap
+    position: int
 
+    def __init__(self, buffer: bytes | mmap.mmap, position: int = 0):
+        self.buffer = buffer
+        self.position = position
+        self._lines = self._iter_lines()
 
-def _convert_tail_to_properties_value(tail: str) -> str | int:
+    def __iter__(self) -> Iterator[tuple[str | bytes, bytes]]:
+        return self._lines
+
+    def _iter_lines(self) -> Iterator[tuple[str | bytes, bytes]]:
+        find = self.buffer.find
+        buffer = self.buffer
+        size = len(buffer)
+        keywords = _KEYWORDS
+        while self.position < size:
+            start = self.position
+            end = find(b'\n', start)
+            if end == -1:
+                end = size
+            self.position = end + 1
+            line = buffer[start:end].strip()
+            if b' ' in line:
+                word, _, tail = line.partition(b' ')
+                yield keywords.get(word, word), tail.lstrip(b' ')
+            elif line != b'':
+                yield keywords.get(line, line), b''
+
+    def read_bitmap(self, width: int) -> bytes | None:
+        """
+        Decodes the bitmap rows up to the 'ENDCHAR' line in one pass.
+        Returns 'None' without consuming anything if the rows are not one hex word per line, so that the caller
+        can fall back to reading line by line.
+        """
+        buffer = self.buffer
+        end = buffer.find(b'ENDCHAR', self.position)
+        if end == -1:
+            return None
+        block = buffer[self.position:end]
+        words = block.split()
+        row_size = (width + 7) // 8 * 2
+        if len(block) != len(words) * (row_size + 1) or block.count(b'\n') != len(words):
+            return None
+        line_end = buffer.find(b'\n', end)
+        if line_end == -1:
+            line_end = len(buffer)
+        if buffer[end:line_end].strip() != _WORD_ENDCHAR.encode():
+            return None
+        bitmap_data = _decode_hex_bitmap(words, width)
+        self.position = line_end + 1
+        return bitmap_data
+
+    def skip_to(self, word: str):
+        """
+        Moves past the next line that starts with the word, without tokenizing the lines in between.
+        """
+        buffer = self.buffer
+        target = word.encode()
+        start = self.position
+        while True:
+            index = buffer.find(target, start)
+            if index == -1:
+                self.position = len(buffer)
+                raise BdfMissingWordError(word)
+            line_start = buffer.rfind(b'\n', 0, index) + 1
+            line_end = buffer.find(b'\n', index)
+            if line_end == -1:
+                line_end = len(buffer)
+            if buffer[line_start:line_end].split(None, 1)[0] == target:
+                self.position = line_end + 1
+                return
+            start = index + len(target)
+
+
+def _convert_tail_to_str(tail: str | bytes) -> str:
+    if isinstance(tail, bytes):
+        # Lines are trimmed as bytes, which leaves the non-ASCII whitespace that text mode trims.
+        return tail.decode('utf-8').rstrip()
+    return tail
+
+
+def _normalize_line_breaks(buffer: bytes | mmap.mmap) -> bytes | mmap.mmap:
+    """
+    Turns lone CRs into line breaks, as reading in text mode does. Without lone CRs, the buffer is returned as it is.
+    """
+    if _LONE_CR_PATTERN.search(buffer) is None:
+        return buffer
+    return buffer[:].replace(b'\r\n', b'\n').replace(b'\r', b'\n')
+
+
+def _convert_tail_to_ints(tail: str | bytes) -> list[int]:
+    return list(map(int, tail.split()))
+
+
+def _convert_tail_to_properties_value(tail: str | bytes) -> str | int:
+    tail = _convert_tail_to_str(tail)
     if tail.startswith('"') and tail.endswith('"'):
         value = tail.removeprefix('"').removesuffix('"').replace('""', '"')
     else:
@@ -57,161 +219,570 @@ def _convert_tail_to_properties_value(tail: str) -> str | int:
     return value
 
 
-def _parse_properties_segment(lines: Iterator[tuple[str, str]], count: int) -> BdfProperties:
-    properties = BdfProperties()
+def _parse_properties_segment(lines: _Lines, count: int) -> BdfProperties:
+    data = {}
+    comments = []
     for word, tail in lines:
         if word == _WORD_ENDPROPERTIES:
+            properties = BdfProperties(comments=comments)
+            properties.update_bulk(data)
             if len(properties) != count:
                 raise BdfCountError(_WORD_STARTPROPERTIES, count, len(properties))
             return properties
         elif word == _WORD_COMMENT:
-            properties.comments.append(tail)
+            comments.append(_convert_tail_to_str(tail))
         else:
-            properties[word] = _convert_tail_to_properties_value(tail)
+            data[_convert_tail_to_str(word)] = _convert_tail_to_properties_value(tail)
     raise BdfMissingWordError(_WORD_ENDPROPERTIES)
 
 
-def _parse_bitmap_segment(lines: Iterator[tuple[str, str]]) -> list[list[int]]:
-    bitmap = []
+def _parse_bitmap_segment(lines: _Lines, width: int) -> bytes:
+    if isinstance(lines, _BufferLines):
+        bitmap_data = lines.read_bitmap(width)
+        if bitmap_data is not None:
+            return bitmap_data
+    words = []
     for word, _ in lines:
         if word == _WORD_ENDCHAR:
-            return bitmap
+            return _decode_hex_bitmap(words, width)
         else:
-            bin_format = '{:0' + str(len(word) * 4) + 'b}'
-            bin_string = bin_format.format(int(word, 16))
-            bitmap_row = [int(c) for c in bin_string]
-            bitmap.append(bitmap_row)
+            words.append(word)
+    _decode_hex_bitmap(words, width)
     raise BdfMissingWordError(_WORD_ENDCHAR)
 
 
-def _parse_glyph_segment(lines: Iterator[tuple[str, str]], name: str) -> BdfGlyph:
-    encoding = None
-    scalable_width = None
-    device_width = None
-    bounding_box = None
+def _parse_glyph_segment(
+        lines: _Lines,
+        name: str,
+        parse_bitmap_segment: Callable[[_Lines, int], bytes] = _parse_bitmap_segment,
+) -> BdfGlyph:
+    tails = {}
     comments = []
     for word, tail in lines:
-        if word == _WORD_ENCODING:
-            encoding = int(tail)
-        elif word == _WORD_SWIDTH:
-            values = _convert_tail_to_ints(tail)
-            scalable_width = values[0], values[1]
-        elif word == _WORD_DWIDTH:
-            values = _convert_tail_to_ints(tail)
-            device_width = values[0], values[1]
-        elif word == _WORD_BBX:
-            values = _convert_tail_to_ints(tail)
-            bounding_box = values[0], values[1], values[2], values[3]
+        if word in _GLYPH_METRICS_WORDS:
+            tails[word] = tail
         elif word == _WORD_COMMENT:
-            comments.append(tail)
+            comments.append(_convert_tail_to_str(tail))
         elif word == _WORD_BITMAP or word == _WORD_ENDCHAR:
-            if encoding is None:
-                raise BdfMissingWordError(_WORD_ENCODING)
-            if scalable_width is None:
-                raise BdfMissingWordError(_WORD_SWIDTH)
-            if device_width is None:
-                raise BdfMissingWordError(_WORD_DWIDTH)
-            if bounding_box is None:
-                raise BdfMissingWordError(_WORD_BBX)
+            for metrics_word in _GLYPH_METRICS_WORDS:
+                if metrics_word not in tails:
+                    raise BdfMissingWordError(metrics_word)
+            scalable_width = _convert_tail_to_ints(tails[_WORD_SWIDTH])
+            device_width = _convert_tail_to_ints(tails[_WORD_DWIDTH])
+            bounding_box = _convert_tail_to_ints(tails[_WORD_BBX])
             if word == _WORD_BITMAP:
-                bitmap = _parse_bitmap_segment(lines)
-                bitmap = [bitmap_row[:bounding_box[0]] for bitmap_row in bitmap]
+                bitmap_data = parse_bitmap_segment(lines, bounding_box[0])
             else:
-                bitmap = None
+                bitmap_data = b''
             return BdfGlyph(
                 name,
-                encoding,
-                scalable_width,
-                device_width,
-                bounding_box,
-                bitmap,
-                comments,
+                int(tails[_WORD_ENCODING]),
+                (scalable_width[0], scalable_width[1]),
+                (device_width[0], device_width[1]),
+                (bounding_box[0], bounding_box[1], bounding_box[2], bounding_box[3]),
+                None,
+                comments or None,
+                bitmap_data,
             )
         else:
-            raise BdfIllegalWordError(word)
+            raise BdfIllegalWordError(_convert_tail_to_str(word))
     raise BdfMissingWordError(_WORD_ENDCHAR)
 
 
-def _parse_font_segment(lines: Iterator[tuple[str, str]]) -> 'BdfFont':
-    name = None
-    point_size = None
-    resolution = None
-    bounding_box = None
-    properties = None
-    glyphs_count = None
-    glyphs = []
-    comments = []
+class _LazyBdfGlyph(BdfGlyph):
+    """
+    A glyph that only knows its encoding and the span of its block in the buffer, and parses the rest of the block
+    on first use. The name can be read from the 'STARTCHAR' line alone.
+    Until the glyph is changed, dumping the font copies the block from the buffer instead of formatting it.
+    Setting any attribute counts as a change, and so does getting the bitmap or the comments, which can be changed
+    in place.
+    """
+
+    __slots__ = ('_buffer', '_start', '_end', '_loaded', '_dirty')
+
+    def __init__(self, encoding: int, buffer: bytes | mmap.mmap, start: int, end: int):
+        object.__setattr__(self, 'encoding', encoding)
+        object.__setattr__(self, '_buffer', buffer)
+        object.__setattr__(self, '_start', start)
+        object.__setattr__(self, '_end', end)
+        object.__setattr__(self, '_loaded', False)
+        object.__setattr__(self, '_dirty', False)
+
+    def _load(self):
+        lines = _BufferLines(self._buffer, self._start)
+        _, tail = next(iter(lines))
+        glyph = _parse_glyph_segment(lines, _convert_tail_to_str(tail))
+        for key in BdfGlyph.__slots__:
+            if key != '__weakref__':
+                object.__setattr__(self, key, getattr(glyph, key))
+        object.__setattr__(self, '_loaded', True)
+
+    def __getattr__(self, key: str) -> Any:
+        if self._loaded:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
+        if key == 'name':
+            _, tail = next(iter(_BufferLines(self._buffer, self._start)))
+            object.__setattr__(self, 'name', _convert_tail_to_str(tail))
+            return self.name
+        self._load()
+        return getattr(self, key)
+
+    def __setattr__(self, key: str, value: Any):
+        if not self._loaded:
+            self._load()
+        object.__setattr__(self, '_dirty', True)
+        super().__setattr__(key, value)
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """
+        Copies and pickles are plain glyphs, parsed here, that do not keep the buffer.
+        """
+        return BdfGlyph, (
+            self.name,
+            self.encoding,
+            self.scalable_width,
+            self.device_width,
+            self.bounding_box,
+            None,
+            self._comments,
+            self.bitmap_data,
+        )
+
+    @property
+    def comments(self) -> list[str]:
+        object.__setattr__(self, '_dirty', True)
+        return BdfGlyph.comments.fget(self)
+
+    @comments.setter
+    def comments(self, value: list[str]):
+        BdfGlyph.comments.fset(self, value)
+
+    @property
+    def bitmap(self) -> list[list[int]]:
+        object.__setattr__(self, '_dirty', True)
+        return BdfGlyph.bitmap.fget(self)
+
+    @bitmap.setter
+    def bitmap(self, value: list[list[int]]):
+        BdfGlyph.bitmap.fset(self, value)
+
+
+def _scan_glyph_segment(lines: _BufferLines, name: str) -> BdfGlyph:
+    start = lines.buffer.rfind(b'\n', 0, lines.position - 1) + 1
+    for word, tail in lines:
+        if word == _WORD_ENCODING:
+            encoding = int(tail)
+            break
+        elif word == _WORD_BITMAP or word == _WORD_ENDCHAR or word == _WORD_STARTCHAR or word == _WORD_ENDFONT:
+            raise BdfMissingWordError(_WORD_ENCODING)
+    else:
+        raise BdfMissingWordError(_WORD_ENDCHAR)
+    lines.skip_to(_WORD_ENDCHAR)
+    return _LazyBdfGlyph(encoding, lines.buffer, start, lines.position)
+
+
+def _check_font_words(words: set[str]):
+    for metrics_word in _FONT_METRICS_WORDS:
+        if metrics_word not in words:
+            raise BdfMissingWordError(metrics_word)
+
+
+def _iter_font_segment(
+        lines: _Lines,
+        font: 'BdfFont',
+        parse_glyph_segment: Callable[[_Lines, str], BdfGlyph],
+        check_header: bool,
+        parse_properties_segment: Callable[[_Lines, int], BdfProperties],
+) -> Iterator[BdfGlyph]:
+    """
+    Fills the header of the font while yielding its glyphs one by one.
+    With 'check_header', the header words are required before the first glyph, instead of before 'ENDFONT'.
+    """
+    words = set()
+    glyphs_count = 0
     for word, tail in lines:
-        if word == _WORD_FONT:
-            name = tail
+        if word == _WORD_STARTCHAR:
+            if check_header and glyphs_count == 0:
+                _check_font_words(words)
+            glyphs_count += 1
+            yield parse_glyph_segment(lines, _convert_tail_to_str(tail))
+        elif word == _WORD_FONT:
+            font.name = _convert_tail_to_str(tail)
+            words.add(word)
         elif word == _WORD_SIZE:
             values = _convert_tail_to_ints(tail)
-            point_size = values[0]
-            resolution = values[1], values[2]
+            font.point_size = values[0]
+            font.resolution = values[1], values[2]
+            words.add(word)
         elif word == _WORD_FONTBOUNDINGBOX:
             values = _convert_tail_to_ints(tail)
-            bounding_box = values[0], values[1], values[2], values[3]
+            font.bounding_box = values[0], values[1], values[2], values[3]
+            words.add(word)
         elif word == _WORD_STARTPROPERTIES:
-            properties = _parse_properties_segment(lines, int(tail))
+            font.properties = parse_properties_segment(lines, int(tail))
         elif word == _WORD_CHARS:
-            glyphs_count = int(tail)
-        elif word == _WORD_STARTCHAR:
-            glyphs.append(_parse_glyph_segment(lines, tail))
+            font_glyphs_count = int(tail)
+            words.add(word)
         elif word == _WORD_COMMENT:
-            comments.append(tail)
+            font.comments.append(_convert_tail_to_str(tail))
         elif word == _WORD_ENDFONT:
-            if name is None:
-                raise BdfMissingWordError(_WORD_FONT)
-            if point_size is None or resolution is None:
-                raise BdfMissingWordError(_WORD_SIZE)
-            if bounding_box is None:
-                raise BdfMissingWordError(_WORD_FONTBOUNDINGBOX)
-            if glyphs_count is None:
-                raise BdfMissingWordError(_WORD_CHARS)
-            if len(glyphs) != glyphs_count:
-                raise BdfCountError(_WORD_CHARS, glyphs_count, len(glyphs))
-            return BdfFont(
-                name,
-                point_size,
-                resolution,
-                bounding_box,
-                properties,
-                glyphs,
-                comments,
-            )
+            _check_font_words(words)
+            if glyphs_count != font_glyphs_count:
+                raise BdfCountError(_WORD_CHARS, font_glyphs_count, glyphs_count)
+            return
         else:
-            raise BdfIllegalWordError(word)
+            raise BdfIllegalWordError(_convert_tail_to_str(word))
     raise BdfMissingWordError(_WORD_ENDFONT)
 
 
-def _parse_stream(stream: TextIO) -> 'BdfFont':
-    lines = _create_lines_iterator(stream)
+def _iter_font(
+        lines: _Lines,
+        font: 'BdfFont',
+        parse_glyph_segment: Callable[[_Lines, str], BdfGlyph] = _parse_glyph_segment,
+        check_header: bool = False,
+        parse_properties_segment: Callable[[_Lines, int], BdfProperties] = _parse_properties_segment,
+) -> Iterator[BdfGlyph]:
     for word, tail in lines:
         if word == _WORD_STARTFONT:
+            tail = _convert_tail_to_str(tail)
             if tail != _SPEC_VERSION:
                 raise BdfParseError(f'spec version not support: {tail}')
-            return _parse_font_segment(lines)
+            yield from _iter_font_segment(lines, font, parse_glyph_segment, check_header, parse_properties_segment)
+            return
         else:
-            raise BdfIllegalWordError(word)
+            raise BdfIllegalWordError(_convert_tail_to_str(word))
     raise BdfMissingWordError(_WORD_STARTFONT)
 
 
-def _dump_word_str_line(stream: TextIO, word: str, tail: str | None = None):
-    stream.write(word)
+def _parse_lines(
+        lines: _Lines,
+        parse_glyph_segment: Callable[[_Lines, str], BdfGlyph] = _parse_glyph_segment,
+) -> 'BdfFont':
+    font = BdfFont()
+    font.glyphs = BdfGlyphList(_iter_font(lines, font, parse_glyph_segment))
+    return font
+
+
+class _SegmentTimer:
+    """
+    Wraps the segment parsers to time them and count what they parse. The parsers are only wrapped when stats are
+    asked for, so that they stay free of any checks otherwise.
+    """
+
+    def __init__(self, parse_glyph_segment: Callable[[_Lines, str], BdfGlyph]):
+        self.properties_seconds = 0.0
+        self.glyphs_seconds = 0.0
+        self.bitmaps_seconds = 0.0
+        self.glyphs_count = 0
+        self.bitmap_rows_count = 0
+        self._parse_glyph_segment = parse_glyph_segment
+
+    def parse_properties_segment(self, lines: _Lines, count: int) -> BdfProperties:
+        start = perf_counter()
+        try:
+            return _parse_properties_segment(lines, count)
+        finally:
+            self.properties_seconds += perf_counter() - start
+
+    def parse_glyph_segment(self, lines: _Lines, name: str) -> BdfGlyph:
+        start = perf_counter()
+        try:
+            if self._parse_glyph_segment is _parse_glyph_segment:
+                glyph = _parse_glyph_segment(lines, name, self.parse_bitmap_segment)
+                self.bitmap_rows_count += glyph.height
+            else:
+                glyph = self._parse_glyph_segment(lines, name)
+        finally:
+            self.glyphs_seconds += perf_counter() - start
+        self.glyphs_count += 1
+        return glyph
+
+    def parse_bitmap_segment(self, lines: _Lines, width: int) -> bytes:
+        start = perf_counter()
+        try:
+            return _parse_bitmap_segment(lines, width)
+        finally:
+            self.bitmaps_seconds += perf_counter() - start
+
+
+def _parse_lines_with_stats(
+        lines: _Lines,
+        parse_glyph_segment: Callable[[_Lines, str], BdfGlyph],
+        stats: BdfStats,
+) -> 'BdfFont':
+    timer = _SegmentTimer(parse_glyph_segment)
+    start = perf_counter()
+    try:
+        font = BdfFont()
+        font.glyphs = BdfGlyphList(_iter_font(
+            lines,
+            font,
+            timer.parse_glyph_segment,
+            parse_properties_segment=timer.parse_properties_segment,
+        ))
+        return font
+    finally:
+        seconds = perf_counter() - start
+        stats.add_seconds('parse', seconds)
+        stats.add_seconds('parse.other', seconds - timer.properties_seconds - timer.glyphs_seconds)
+        stats.add_seconds('parse.properties', timer.properties_seconds)
+        stats.add_seconds('parse.glyphs', timer.glyphs_seconds - timer.bitmaps_seconds)
+        stats.add_seconds('parse.bitmaps', timer.bitmaps_seconds)
+        stats.add_count('parse.glyphs', timer.glyphs_count)
+        stats.add_count('parse.bitmap_rows', timer.bitmap_rows_count)
+
+
+class _CountedLines:
+    """
+    Counts the lines and characters of a text stream as they are read.
+    """
+
+    def __init__(self, stream: Iterable[str]):
+        self.stream = stream
+        self.lines_count = 0
+        self.chars_count = 0
+
+    def __iter__(self) -> Iterator[str]:
+        for line in self.stream:
+            self.lines_count += 1
+            self.chars_count += len(line)
+            yield line
+
+
+# The number of bytes copied at a time to count the lines of a mapped file.
+_COUNT_CHUNK_SIZE = 1 << 20
+
+
+def _count_lines(buffer: bytes | mmap.mmap) -> int:
+    count = 0
+    for start in range(0, len(buffer), _COUNT_CHUNK_SIZE):
+        count += buffer[start:start + _COUNT_CHUNK_SIZE].count(b'\n')
+    if len(buffer) > 0 and buffer[-1:] != b'\n':
+        count += 1
+    return count
+
+
+class _MappedFile(mmap.mmap):
+    """
+    A read-only mapping that remembers the path of its file, so that saving over the file can close it first.
+    """
+
+    file_path: str | None
+
+
+def _map_file(file: BinaryIO) -> mmap.mmap | bytes:
+    """
+    Maps the file into memory. A file with lone CRs is read with its line breaks normalized instead.
+    """
+    try:
+        buffer = _MappedFile(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except ValueError:
+        # Empty files cannot be mapped.
+        return file.read()
+    buffer.file_path = os.path.abspath(file.name) if isinstance(file.name, str) else None
+    normalized = _normalize_line_breaks(buffer)
+    if normalized is not buffer:
+        buffer.close()
+    return normalized
+
+
+def _close_buffer(buffer: mmap.mmap | bytes):
+    if isinstance(buffer, mmap.mmap):
+        buffer.close()
+
+
+def _is_mapping_of(buffer: mmap.mmap | bytes, file_path: str | PathLike[str]) -> bool:
+    if not isinstance(buffer, _MappedFile) or buffer.file_path is None or buffer.closed:
+        return False
+    try:
+        return os.path.samefile(buffer.file_path, file_path)
+    except OSError:
+        return False
+
+
+def _release_mapping_of(glyphs: list[BdfGlyph], file_path: str | PathLike[str]):
+    """
+    Moves the lazy glyphs mapped from the file onto a copy of the mapping in memory, and closes the mapping.
+    Windows cannot replace a file while it is mapped.
+    """
+    copies = {}
+    for glyph in glyphs:
+        if isinstance(glyph, _LazyBdfGlyph):
+            buffer = glyph._buffer
+            if id(buffer) not in copies:
+                copies[id(buffer)] = (buffer, buffer[:] if _is_mapping_of(buffer, file_path) else None)
+            data = copies[id(buffer)][1]
+            if data is not None:
+                object.__setattr__(glyph, '_buffer', data)
+    for buffer, data in copies.values():
+        if data is not None:
+            buffer.close()
+
+
+def _stop_at_glyph_segment(lines: _Lines, name: str) -> None:
+    pass
+
+
+def _split_glyph_section(buffer: bytes | mmap.mmap, start: int, count: int) -> list[int]:
+    """
+    Splits the buffer from 'start' into about 'count' chunks of equal size, each beginning at a 'STARTCHAR' line.
+    Returns the boundaries, including 'start' and the end of the buffer.
+    """
+    size = len(buffer)
+    boundaries = [start]
+    for index in range(1, count):
+        position = buffer.find(b'\nSTARTCHAR', start + (size - start) * index // count)
+        if position == -1:
+            break
+        if position + 1 > boundaries[-1]:
+            boundaries.append(position + 1)
+    boundaries.append(size)
+    return boundaries
+
+
+def _parse_glyph_section_chunk(file_path: str, start: int, end: int) -> bytes:
+    """
+    Runs in a worker process. Parses the glyphs between the two offsets of the file, which must be nothing but
+    glyph segments, except for the last chunk that ends with 'ENDFONT'.
+    """
+    with open(file_path, 'rb') as file:
+        buffer = _map_file(file)
+    try:
+        lines = _BufferLines(buffer[start:end])
+        last = end == len(buffer)
+    finally:
+        _close_buffer(buffer)
+    glyphs = []
+    for word, tail in lines:
+        if word == _WORD_STARTCHAR:
+            glyphs.append(_parse_glyph_segment(lines, _convert_tail_to_str(tail)))
+        elif word == _WORD_ENDFONT and last:
+            return _pack_glyphs(glyphs)
+        else:
+            raise BdfIllegalWordError(_convert_tail_to_str(word))
+    if last:
+        raise BdfMissingWordError(_WORD_ENDFONT)
+    return _pack_glyphs(glyphs)
+
+
+def _read_glyphs_count(header: bytes | mmap.mmap) -> int | None:
+    glyphs_count = None
+    for word, tail in _BufferLines(header):
+        if word == _WORD_CHARS:
+            glyphs_count = int(tail)
+    return glyphs_count
+
+
+def _load_in_workers(file_path: str, buffer: bytes | mmap.mmap, workers: int) -> 'BdfFont':
+    """
+    Parses the header here, and the glyph section in chunks in a pool of processes.
+    Anything unexpected makes it give up, and the caller parses the whole file serially instead, which raises
+    the same error as a serial parse would.
+    """
+    font = BdfFont()
+    lines = _BufferLines(buffer)
+    for _ in _iter_font(lines, font, _stop_at_glyph_segment, True):
+        break
+    else:
+        return font
+    start = buffer.rfind(b'\n', 0, lines.position - 1) + 1
+    glyphs_count = _read_glyphs_count(buffer[:start])
+    boundaries = _split_glyph_section(buffer, start, workers)
+    with ProcessPoolExecutor(min(workers, len(boundaries) - 1)) as executor:
+        chunks = list(executor.map(_parse_glyph_section_chunk, repeat(file_path), boundaries[:-1], boundaries[1:]))
+    glyphs = BdfGlyphList()
+    for chunk in chunks:
+        glyphs.extend(_unpack_glyphs(chunk))
+    if len(glyphs) != glyphs_count:
+        raise BdfCountError(_WORD_CHARS, glyphs_count, len(glyphs))
+    font.glyphs = glyphs
+    return font
+
+
+def _pack_font(font: 'BdfFont') -> bytes:
+    return marshal.dumps((
+        font.name,
+        font.point_size,
+        font.resolution_x,
+        font.resolution_y,
+        font.width,
+        font.height,
+        font.offset_x,
+        font.offset_y,
+        dict(font.properties),
+        font.properties.comments,
+        font.comments,
+        _pack_glyphs(font.glyphs),
+    ))
+
+
+def _unpack_font(data: bytes) -> 'BdfFont':
+    (
+        name,
+        point_size,
+        resolution_x,
+        resolution_y,
+        width,
+        height,
+        offset_x,
+        offset_y,
+        properties,
+        properties_comments,
+        comments,
+        glyphs,
+    ) = marshal.loads(data)
+    return BdfFont(
+        name,
+        point_size,
+        (resolution_x, resolution_y),
+        (width, height, offset_x, offset_y),
+        BdfProperties.from_trusted(properties, properties_comments),
+        BdfGlyphList(_unpack_glyphs(glyphs)),
+        comments,
+    )
+
+
+def _format_word_str_line(word: str, tail: str | None = None) -> str:
     if tail is not None:
         tail = tail.strip()
         if tail != '':
-            if len(tail.splitlines()) > 1:
+            # Every line break character is unprintable, so most tails skip the 'splitlines' check.
+            if not tail.isprintable() and len(tail.splitlines()) > 1:
                 raise BdfDumpError('tail cannot be multi-line string')
-            stream.write(f' {tail}')
-    stream.write('\n')
+            return f'{word} {tail}\n'
+    return f'{word}\n'
+
+
+def _format_word_ints_line(word: str, *values: int) -> str:
+    return ' '.join([word, *map(str, values)]) + '\n'
+
+
+def _load_with_cache(
+        file_path: str | PathLike[str],
+        cache_dir: str | PathLike[str],
+        cache_hash: bool,
+        mmap: bool,
+        workers: int | None,
+        stats: BdfStats | None,
+) -> 'BdfFont':
+    file_path = os.path.abspath(file_path)
+    cache_path = _get_cache_path(cache_dir, file_path)
+    cache_key = _get_cache_key(file_path, cache_hash)
+    font = _read_cache(cache_path, cache_key, _unpack_font)
+    if font is None:
+        font = BdfFont.load(file_path, mmap=mmap, workers=workers, stats=stats)
+        _write_cache(cache_path, cache_key, _pack_font(font))
+    elif stats is not None:
+        stats.add_count('load.cache_hits', 1)
+    return font
+
+
+def _dump_word_str_line(stream: TextIO, word: str, tail: str | None = None):
+    stream.write(_format_word_str_line(word, tail))
 
 
 def _dump_word_ints_line(stream: TextIO, word: str, *values: int):
-    stream.write(word)
-    for value in values:
-        stream.write(f' {value}')
-    stream.write('\n')
+    stream.write(_format_word_ints_line(word, *values))
 
 
 def _dump_properties_line(stream: TextIO, key: str, value: str | int):
@@ -223,7 +794,7 @@ def _dump_properties_line(stream: TextIO, key: str, value: str | int):
     stream.write(f'{key} {value}\n')
 
 
-def _dump_stream(stream: TextIO, font: 'BdfFont'):
+def _dump_header(stream: TextIO, font: 'BdfFont'):
     _dump_word_str_line(stream, _WORD_STARTFONT, _SPEC_VERSION)
     for comment in font.comments:
         _dump_word_str_line(stream, _WORD_COMMENT, comment)
@@ -238,44 +809,329 @@ def _dump_stream(stream: TextIO, font: 'BdfFont'):
         _dump_properties_line(stream, key, value)
     _dump_word_str_line(stream, _WORD_ENDPROPERTIES)
 
-    _dump_word_ints_line(stream, _WORD_CHARS, len(font.glyphs))
-    for glyph in font.glyphs:
-        _dump_word_str_line(stream, _WORD_STARTCHAR, glyph.name)
-        for comment in glyph.comments:
-            _dump_word_str_line(stream, _WORD_COMMENT, comment)
-        _dump_word_ints_line(stream, _WORD_ENCODING, glyph.encoding)
-        _dump_word_ints_line(stream, _WORD_SWIDTH, glyph.scalable_width_x, glyph.scalable_width_y)
-        _dump_word_ints_line(stream, _WORD_DWIDTH, glyph.device_width_x, glyph.device_width_y)
-        _dump_word_ints_line(stream, _WORD_BBX, glyph.width, glyph.height, glyph.offset_x, glyph.offset_y)
-        _dump_word_str_line(stream, _WORD_BITMAP)
-
-        bitmap_width = math.ceil(glyph.width / 8) * 8
-        for bitmap_row in glyph.bitmap:
-            if len(bitmap_row) < bitmap_width:
-                bitmap_row = bitmap_row + [0] * (bitmap_width - len(bitmap_row))
-            elif len(bitmap_row) > bitmap_width:
-                bitmap_row = bitmap_row[:bitmap_width]
-            bin_string = ''.join(map(str, bitmap_row))
-            hex_format = '{:0' + str(len(bitmap_row) // 4) + 'X}'
-            hex_value = hex_format.format(int(bin_string, 2))
-            stream.write(f'{hex_value}\n')
-
-        _dump_word_str_line(stream, _WORD_ENDCHAR)
-
-    _dump_word_str_line(stream, _WORD_ENDFONT)
+
+def _format_glyph(glyph: BdfGlyph) -> str:
+    """
+    Builds the whole glyph segment as one string, which is much cheaper than writing it line by line.
+    """
+    if glyph._comments:
+        head = _format_word_str_line(_WORD_STARTCHAR, glyph.name) + ''.join([
+            _format_word_str_line(_WORD_COMMENT, comment) for comment in glyph._comments
+        ])
+    else:
+        head = _format_word_str_line(_WORD_STARTCHAR, glyph.name)
+    return (f'{head}'
+            f'{_WORD_ENCODING} {glyph.encoding}\n'
+            f'{_WORD_SWIDTH} {glyph.scalable_width_x} {glyph.scalable_width_y}\n'
+            f'{_WORD_DWIDTH} {glyph.device_width_x} {glyph.device_width_y}\n'
+            f'{_WORD_BBX} {glyph.width} {glyph.height} {glyph.offset_x} {glyph.offset_y}\n'
+            f'{_WORD_BITMAP}\n'
+            f'{_encode_hex_bitmap(glyph.bitmap_data, glyph.width)}'
+            f'{_WORD_ENDCHAR}\n')
+
+
+def _dump_glyph(stream: TextIO, glyph: BdfGlyph):
+    stream.write(_format_glyph(glyph))
+
+
+# The number of glyphs joined into each write.
+_DUMP_CHUNK_SIZE = 1024
+
+
+def _iter_dump_glyph_chunks(glyphs: list[BdfGlyph], binary: bool) -> Iterator[str | bytes]:
+    """
+    Formats the glyphs, except for runs of unchanged lazy glyphs that are next to each other in the buffer, whose
+    blocks are copied in one slice. A run with CR line endings is formatted instead, to keep the output LF only.
+    The chunks are bytes when 'binary', and strings otherwise.
+    """
+    formatted = []
+    run = []
+    for glyph in glyphs:
+        if isinstance(glyph, _LazyBdfGlyph) and not glyph._dirty:
+            if len(run) > 0 and (run[-1]._buffer is not glyph._buffer or run[-1]._end != glyph._start):
+                yield from _iter_dump_glyph_run(run, formatted, binary)
+                run.clear()
+            run.append(glyph)
+        else:
+            if len(run) > 0:
+                yield from _iter_dump_glyph_run(run, formatted, binary)
+                run.clear()
+            formatted.append(_format_glyph(glyph))
+    yield from _iter_dump_glyph_run(run, formatted, binary)
+
+
+def _iter_dump_glyph_run(run: list['_LazyBdfGlyph'], formatted: list[str], binary: bool) -> Iterator[str | bytes]:
+    if len(run) > 0:
+        block = run[0]._buffer[run[0]._start:run[-1]._end]
+        if block.endswith(b'\n') and b'\r' not in block:
+            if len(formatted) > 0:
+                yield _to_chunk(''.join(formatted), binary)
+                formatted.clear()
+            yield block if binary else block.decode('utf-8')
+            return
+        formatted.extend(map(_format_glyph, run))
+    if len(formatted) > 0:
+        yield _to_chunk(''.join(formatted), binary)
+        formatted.clear()
+
+
+def _to_chunk(text: str, binary: bool) -> str | bytes:
+    return text.encode('utf-8') if binary else text
+
+
+def _iter_dump_chunks(font: 'BdfFont', binary: bool = True) -> Iterator[str | bytes]:
+    header = StringIO()
+    _dump_header(header, font)
+    _dump_word_ints_line(header, _WORD_CHARS, len(font.glyphs))
+    yield _to_chunk(header.getvalue(), binary)
+    glyphs = font.glyphs
+    for start in range(0, len(glyphs), _DUMP_CHUNK_SIZE):
+        yield from _iter_dump_glyph_chunks(glyphs[start:start + _DUMP_CHUNK_SIZE], binary)
+    yield _to_chunk(_format_word_str_line(_WORD_ENDFONT), binary)
+
+
+def _dump_stream(stream: TextIO, font: 'BdfFont'):
+    stream.writelines(_iter_dump_chunks(font, False))
+
+
+def _count_bitmap_rows(glyphs: list[BdfGlyph]) -> int:
+    """
+    Sums the heights of the glyphs, leaving out the lazy glyphs that are not loaded yet rather than loading them.
+    """
+    return sum([
+        glyph.height for glyph in glyphs if not isinstance(glyph, _LazyBdfGlyph) or glyph._loaded
+    ])
+
+
+def _write_dump_chunks(font: 'BdfFont', write: Callable[[Any], Any], stats: BdfStats, binary: bool = True):
+    """
+    Writes the chunks of the font one by one, timing the formatting of the header, of the glyphs and the writes
+    apart. The chunks are strings, and counted in characters, unless 'binary'.
+    """
+    chunks = _iter_dump_chunks(font, binary)
+    line_break = b'\n' if binary else '\n'
+    phase = 'dump.header'
+    header_seconds = 0.0
+    glyphs_seconds = 0.0
+    write_seconds = 0.0
+    bytes_count = 0
+    lines_count = 0
+    total_start = perf_counter()
+    try:
+        while True:
+            start = perf_counter()
+            chunk = next(chunks, None)
+            middle = perf_counter()
+            if phase == 'dump.header':
+                header_seconds += middle - start
+                phase = 'dump.glyphs'
+            else:
+                glyphs_seconds += middle - start
+            if chunk is None:
+                break
+            write(chunk)
+            write_seconds += perf_counter() - middle
+            bytes_count += len(chunk)
+            lines_count += chunk.count(line_break)
+    finally:
+        stats.add_seconds('dump', perf_counter() - total_start)
+        stats.add_seconds('dump.header', header_seconds)
+        stats.add_seconds('dump.glyphs', glyphs_seconds)
+        stats.add_seconds('dump.write', write_seconds)
+        stats.add_count('dump.lines', lines_count)
+        stats.add_count('dump.bytes', bytes_count)
+    stats.add_count('dump.glyphs', len(font.glyphs))
+    stats.add_count('dump.bitmap_rows', _count_bitmap_rows(font.glyphs))
+
+
+def _dump_file(file: BinaryIO, font: 'BdfFont', stats: BdfStats | None):
+    if stats is None:
+        file.writelines(_iter_dump_chunks(font))
+    else:
+        _write_dump_chunks(font, file.write, stats)
 
 
 class BdfFont:
+    __slots__ = (
+        'name',
+        'point_size',
+        'resolution_x',
+        'resolution_y',
+        'width',
+        'height',
+        'offset_x',
+        'offset_y',
+        'properties',
+        '_glyphs',
+        'comments',
+        '_text_renderer',
+        '__weakref__',
+    )
+
     @staticmethod
-    def parse(stream: str | TextIO) -> 'BdfFont':
+    def parse(stream: str | TextIO, stats: BdfStats | None = None) -> 'BdfFont':
+        """
+        :param stream:
+            The content of the font file, or a text stream of it.
+        :param stats:
+            Add the seconds spent in each phase and the counts of what was parsed to this object.
+        """
         if isinstance(stream, str):
             stream = StringIO(stream)
-        return _parse_stream(stream)
+        if stats is None:
+            return _parse_lines(_create_lines_iterator(stream))
+        counted_lines = _CountedLines(stream)
+        try:
+            return _parse_lines_with_stats(_create_lines_iterator(counted_lines), _parse_glyph_segment, stats)
+        finally:
+            stats.add_count('parse.lines', counted_lines.lines_count)
+            stats.add_count('parse.bytes', counted_lines.chars_count)
 
     @staticmethod
-    def load(file_path: str | PathLike[str]) -> 'BdfFont':
-        with open(file_path, 'r', encoding='utf-8') as file:
-            return BdfFont.parse(file)
+    def parse_bytes(
+            buffer: bytes | bytearray | memoryview | mmap.mmap,
+            lazy: bool = False,
+            bitmap_pool: BdfBitmapPool | None = None,
+            stats: BdfStats | None = None,
+    ) -> 'BdfFont':
+        """
+        :param buffer:
+            The content of the font file.
+        :param lazy:
+            Only index the glyphs by their encoding and position in the buffer, and parse each glyph when it
+            is first used. The buffer is kept by the glyphs, and errors inside a glyph are raised when it is parsed.
+            Dumping copies the glyphs that have not changed from the buffer as they are, see 'save'.
+        :param bitmap_pool:
+            Share identical bitmaps through this pool, with the other fonts that use it. Cannot be combined with
+            'lazy'.
+        :param stats:
+            Add the seconds spent in each phase and the counts of what was parsed to this object, see 'BdfStats'.
+            Without it, the parse is not instrumented at all.
+        """
+        if isinstance(buffer, (bytearray, memoryview)):
+            buffer = bytes(buffer)
+        if bitmap_pool is not None and lazy:
+            raise ValueError("'bitmap_pool' cannot be combined with 'lazy'")
+        buffer = _normalize_line_breaks(buffer)
+        parse_glyph_segment = _scan_glyph_segment if lazy else _parse_glyph_segment
+        if stats is None:
+            font = _parse_lines(_BufferLines(buffer), parse_glyph_segment)
+        else:
+            stats.add_count('parse.lines', _count_lines(buffer))
+            stats.add_count('parse.bytes', len(buffer))
+            font = _parse_lines_with_stats(_BufferLines(buffer), parse_glyph_segment, stats)
+        if bitmap_pool is not None:
+            bitmap_pool.intern_glyphs(font.glyphs)
+        return font
+
+    @staticmethod
+    def load(
+            file_path: str | PathLike[str],
+            mmap: bool = False,
+            lazy: bool = False,
+            workers: int | None = None,
+            cache_dir: str | PathLike[str] | None = None,
+            cache_hash: bool = False,
+            bitmap_pool: BdfBitmapPool | None = None,
+            stats: BdfStats | None = None,
+    ) -> 'BdfFont':
+        """
+        :param file_path:
+            The path of the font file.
+        :param mmap:
+            Map the file into memory instead of reading it through a buffered stream.
+        :param lazy:
+            Parse each glyph when it is first used, see 'parse_bytes'. Combined with 'mmap', the file stays mapped
+            while the glyphs are in use, and only the pages of used glyphs are read. Saving copies the blocks of the
+            glyphs that have not changed from the file, see 'save'.
+        :param workers:
+            Split the glyphs at 'STARTCHAR' lines and parse them in this many processes. Only pays off for large
+            fonts. The result and the errors are the same as a serial parse. Cannot be combined with 'lazy'.
+        :param cache_dir:
+            Keep a binary snapshot of the parsed font in this directory, and load from it while the file keeps
+            the same path, size and modification time. Stale or damaged snapshots are rebuilt. Cannot be combined
+            with 'lazy'.
+        :param cache_hash:
+            Also compare the SHA-256 of the file content before using a snapshot.
+        :param bitmap_pool:
+            Share identical bitmaps through this pool, see 'parse_bytes'. Cannot be combined with 'lazy'.
+        :param stats:
+            Add the seconds spent reading the file and in each phase of the parse to this object, see 'BdfStats'.
+            A font loaded from the cache adds no parse phases, and one parsed in workers only adds the whole parse
+            and the counts.
+        """
+        if bitmap_pool is not None:
+            if lazy:
+                raise ValueError("'bitmap_pool' cannot be combined with 'lazy'")
+            font = BdfFont.load(
+                file_path,
+                mmap,
+                workers=workers,
+                cache_dir=cache_dir,
+                cache_hash=cache_hash,
+                stats=stats,
+            )
+            bitmap_pool.intern_glyphs(font.glyphs)
+            return font
+
+        if cache_dir is not None:
+            if lazy:
+                raise ValueError("'cache_dir' cannot be combined with 'lazy'")
+            return _load_with_cache(file_path, cache_dir, cache_hash, mmap, workers, stats)
+
+        if workers is not None and workers > 1:
+            if lazy:
+                raise ValueError("'workers' cannot be combined with 'lazy'")
+            file_path = os.fspath(file_path)
+            start = perf_counter()
+            with open(file_path, 'rb') as file:
+                buffer = _map_file(file)
+            if stats is not None:
+                stats.add_seconds('load.read', perf_counter() - start)
+            try:
+                start = perf_counter()
+                font = _load_in_workers(file_path, buffer, workers)
+                if stats is not None:
+                    stats.add_seconds('parse', perf_counter() - start)
+                    stats.add_count('parse.lines', _count_lines(buffer))
+                    stats.add_count('parse.bytes', len(buffer))
+                    stats.add_count('parse.glyphs', len(font.glyphs))
+                return font
+            except Exception:
+                return BdfFont.parse_bytes(buffer, stats=stats)
+            finally:
+                _close_buffer(buffer)
+
+        start = perf_counter()
+        with open(file_path, 'rb') as file:
+            buffer = _map_file(file) if mmap else file.read()
+        if stats is not None:
+            stats.add_seconds('load.read', perf_counter() - start)
+        try:
+            font = BdfFont.parse_bytes(buffer, lazy, stats=stats)
+        except BaseException:
+            _close_buffer(buffer)
+            raise
+        if not lazy:
+            _close_buffer(buffer)
+        return font
+
+    @staticmethod
+    def load_pcf(file_path: str | PathLike[str]) -> 'BdfFont':
+        """
+        Loads a font in the Portable Compiled Format. PCF has no comments, no 'SIZE' line and no y of the device
+        widths, so the point size and resolutions come from the properties, and the bounding box from the glyph
+        metrics. To look up single glyphs without decoding the others, use 'PcfReader'.
+        """
+        reader = PcfReader.load(file_path)
+        return BdfFont(
+            reader.name,
+            reader.point_size,
+            (reader.resolution_x, reader.resolution_y),
+            reader.bounding_box,
+            reader.properties,
+            reader.read_glyphs(),
+        )
 
     name: str
     point_size: int
@@ -286,8 +1142,9 @@ class BdfFont:
     offset_x: int
     offset_y: int
     properties: BdfProperties
-    glyphs: list[BdfGlyph]
+    _glyphs: BdfGlyphList
     comments: list[str]
+    _text_renderer: BdfTextRenderer | None
 
     def __init__(
             self,
@@ -313,7 +1170,7 @@ class BdfFont:
         :param properties:
             The optional extended properties.
         :param glyphs:
-            The glyphs.
+            The glyphs, see 'glyphs'.
         :param comments:
             The comments.
         """
@@ -322,8 +1179,9 @@ class BdfFont:
         self.resolution_x, self.resolution_y = resolution
         self.width, self.height, self.offset_x, self.offset_y = bounding_box
         self.properties = BdfProperties() if properties is None else properties
-        self.glyphs = [] if glyphs is None else glyphs
+        self.glyphs = BdfGlyphList() if glyphs is None else glyphs
         self.comments = [] if comments is None else comments
+        self._text_renderer = None
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, BdfFont):
@@ -340,6 +1198,156 @@ class BdfFont:
                 self.glyphs == other.glyphs and
                 self.comments == other.comments)
 
+    @property
+    def glyphs(self) -> BdfGlyphList:
+        """
+        The glyphs. When set, a 'BdfGlyphList' is kept as it is, and any other list is copied into a new
+        'BdfGlyphList', which keeps the indexes and metrics of the glyphs. Later changes to the given list do not
+        reach the font, so change 'font.glyphs' itself instead.
+        """
+        return self._glyphs
+
+    @glyphs.setter
+    def glyphs(self, value: list[BdfGlyph]):
+        self._glyphs = value if isinstance(value, BdfGlyphList) else BdfGlyphList(value)
+
+    def get_glyph(self, encoding: int) -> BdfGlyph | None:
+        return self._glyphs.get_by_encoding(encoding)
+
+    def get_glyph_by_name(self, name: str) -> BdfGlyph | None:
+        return self._glyphs.get_by_name(name)
+
+    def get_glyphs_in_range(self, start: int, stop: int) -> list[BdfGlyph]:
+        return self._glyphs.get_in_range(start, stop)
+
+    @property
+    def text_renderer(self) -> BdfTextRenderer:
+        """
+        The renderer behind 'render_text' and 'measure_text', which keeps recently used glyphs decoded.
+        """
+        if self._text_renderer is None:
+            self._text_renderer = BdfTextRenderer(self)
+        return self._text_renderer
+
+    def measure_text(self, text: str) -> tuple[int, int]:
+        return self.text_renderer.measure_text(text)
+
+    def render_text(self, text: str) -> list[list[int]]:
+        return self.text_renderer.render_text(text)
+
+    def build_atlas(self, max_width: int = 1024, padding: int = 1) -> BdfAtlas:
+        """
+        Packs the bitmaps of all glyphs into one alpha texture, for renderers that draw text from a texture.
+
+        :param max_width:
+            The width of the atlas in pixels.
+        :param padding:
+            The empty pixels around each bitmap.
+        """
+        return _build_atlas(self.glyphs, max_width, padding)
+
+    def bitmaps_as_array(self, packed: bool = False) -> tuple['np.ndarray', 'np.ndarray']:
+        """
+        Stacks the bitmaps of all glyphs into one zero-padded uint8 array of shape (glyphs, rows, columns), with
+        each bitmap in the top left corner of its cell. Returns it with an int32 array of shape (glyphs, 4) that
+        holds the bounding box of each glyph. Requires NumPy.
+
+        :param packed:
+            Keep the rows packed, with one column per byte instead of one per pixel.
+        """
+        import numpy as np
+
+        glyphs = self.glyphs
+        count = len(glyphs)
+        bounding_boxes = np.array([glyph.bounding_box for glyph in glyphs], np.int32).reshape(count, 4)
+        strides = (bounding_boxes[:, 0].astype(np.intp) + 7) // 8
+        bitmaps = []
+        for glyph, stride in zip(glyphs, strides.tolist()):
+            bitmap_data = glyph.bitmap_data
+            if stride > 0 and len(bitmap_data) % stride != 0:
+                bitmap_data = bitmap_data[:len(bitmap_data) // stride * stride]
+            bitmaps.append(bitmap_data)
+        sizes = np.fromiter(map(len, bitmaps), np.intp, count)
+        rows = sizes // np.maximum(strides, 1)
+        stack = np.zeros((count, rows.max(initial=0), strides.max(initial=0)), np.uint8)
+
+        # Scatter all bytes into their cells at once, by the glyph, row and column of each byte.
+        data = np.frombuffer(b''.join(bitmaps), np.uint8)
+        owners = np.repeat(np.arange(count), sizes)
+        positions = np.arange(len(data)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+        owner_strides = strides[owners]
+        stack[owners, positions // owner_strides, positions % owner_strides] = data
+
+        if not packed:
+            stack = np.unpackbits(stack, axis=2)[:, :, :bounding_boxes[:, 0].max(initial=0)]
+        return stack, bounding_boxes
+
+    def set_bitmaps_from_array(self, bitmaps: 'np.ndarray', packed: bool = False):
+        """
+        Replaces the bitmaps of all glyphs from a stack in the layout of 'bitmaps_as_array'. Each glyph takes the
+        top left corner of its cell in the size of its current bounding box, and any non-zero pixel is set.
+        Requires NumPy.
+
+        :param bitmaps:
+            The stack of bitmaps, one cell per glyph in the same order.
+        :param packed:
+            The rows are packed, with one column per byte instead of one per pixel.
+        """
+        import numpy as np
+
+        glyphs = self.glyphs
+        if len(bitmaps) != len(glyphs):
+            raise ValueError(f'expected {len(glyphs)} bitmaps, got {len(bitmaps)}')
+        widths = np.fromiter((glyph.width for glyph in glyphs), np.intp, len(glyphs))
+        heights = np.fromiter((glyph.height for glyph in glyphs), np.intp, len(glyphs))
+        strides = (widths + 7) // 8
+        if packed:
+            columns = strides.max(initial=0)
+        else:
+            columns = widths.max(initial=0)
+        if bitmaps.ndim != 3 or bitmaps.shape[1] < heights.max(initial=0) or bitmaps.shape[2] < columns:
+            raise ValueError(f'the cells of shape {bitmaps.shape[1:]} are smaller than the bounding boxes')
+
+        if packed:
+            column_masks = np.packbits(np.arange(bitmaps.shape[2] * 8) < widths[:, None], axis=1)
+            stack = np.asarray(bitmaps, np.uint8) & column_masks[:, None, :]
+        else:
+            pixels = (bitmaps != 0) & (np.arange(bitmaps.shape[2]) < widths[:, None, None])
+            stack = np.packbits(pixels, axis=2)
+
+        # Gather the rows and columns inside each bounding box, which come out glyph by glyph in order.
+        inside = ((np.arange(stack.shape[1]) < heights[:, None])[:, :, None] &
+                  (np.arange(stack.shape[2]) < strides[:, None])[:, None, :])
+        data = stack[inside].tobytes()
+        start = 0
+        for glyph, size in zip(glyphs, (heights * strides).tolist()):
+            glyph.bitmap_data = data[start:start + size]
+            start += size
+
+    def crop_glyphs(self):
+        """
+        Shrinks the bounding box and the bitmap of every glyph to the pixels that are set.
+        """
+        for glyph in self.glyphs:
+            glyph.crop()
+        self._on_glyph_metrics_changed()
+
+    def pad_glyphs_to_font_bbox(self):
+        """
+        Grows the bounding box and the bitmap of every glyph to the font bounding box, so that all glyphs are
+        cells of the same size. Raises 'ValueError' if a glyph is outside the font bounding box.
+        """
+        bounding_box = self.bounding_box
+        for glyph in self.glyphs:
+            glyph.pad(bounding_box)
+        self._on_glyph_metrics_changed()
+
+    def _on_glyph_metrics_changed(self):
+        if self._glyphs._metrics is not None:
+            self._glyphs.track_metrics()
+        if self._text_renderer is not None:
+            self._text_renderer.clear_cache()
+
     @property
     def resolution(self) -> tuple[int, int]:
         return self.resolution_x, self.resolution_y
@@ -380,14 +1388,89 @@ class BdfFont:
         self.resolution_x = self.properties.resolution_x or 0
         self.resolution_y = self.properties.resolution_y or 0
 
-    def dump(self, stream: TextIO):
-        _dump_stream(stream, self)
+    def recompute_metrics(self, incremental: bool = False):
+        """
+        Sets the font bounding box to the union of the glyph bounding boxes, and the properties 'AVERAGE_WIDTH',
+        'FONT_ASCENT', 'FONT_DESCENT' and 'SPACING' to match the glyphs, in one pass over the glyph metrics.
+
+        :param incremental:
+            Keep the glyph metrics up to date as glyphs are added to or removed from the list, so that the next
+            incremental call does not rescan the glyphs. If a glyph changes its metrics in place, call without it.
+        """
+        metrics = self._glyphs._metrics
+        if metrics is None or not incremental:
+            if incremental:
+                metrics = self._glyphs.track_metrics()
+            else:
+                self._glyphs._metrics = None
+                metrics = _GlyphMetrics(self._glyphs)
+        self.bounding_box = metrics.bounding_box
+        self.properties.update_bulk({
+            _KEY_AVERAGE_WIDTH: metrics.average_width,
+            _KEY_FONT_ASCENT: self.height + self.offset_y,
+            _KEY_FONT_DESCENT: -self.offset_y,
+            _KEY_SPACING: metrics.spacing,
+        })
+
+    def dump(self, stream: TextIO, stats: BdfStats | None = None):
+        """
+        :param stream:
+            The text stream to write to.
+        :param stats:
+            Add the seconds spent in each phase and the counts of what was dumped to this object, see 'BdfStats'.
+        """
+        if stats is None:
+            _dump_stream(stream, self)
+        else:
+            _write_dump_chunks(self, stream.write, stats, False)
 
-    def dump_to_string(self) -> str:
+    def dump_to_string(self, stats: BdfStats | None = None) -> str:
         stream = StringIO()
-        self.dump(stream)
+        self.dump(stream, stats)
         return stream.getvalue()
 
-    def save(self, file_path: str | PathLike[str]):
-        with open(file_path, 'w', encoding='utf-8') as file:
-            self.dump(file)
+    def dump_to_bytes(self, stats: BdfStats | None = None) -> bytes:
+        if stats is None:
+            return b''.join(_iter_dump_chunks(self))
+        chunks = []
+        _write_dump_chunks(self, chunks.append, stats)
+        return b''.join(chunks)
+
+    def dump_pcf_to_bytes(self, glyph_pad: int = 4, msb_first: bool = True) -> bytes:
+        """
+        :param glyph_pad:
+            The number of bytes each bitmap row is padded to, one of 1, 2, 4 and 8.
+        :param msb_first:
+            Store the bytes and the bits most significant first, otherwise least significant first.
+        """
+        return _dump_pcf(self, glyph_pad, msb_first)
+
+    def save_pcf(self, file_path: str | PathLike[str], glyph_pad: int = 4, msb_first: bool = True):
+        """
+        Writes the font in the Portable Compiled Format, with the properties, accelerators, metrics, bitmaps,
+        encodings, scalable widths and glyph names tables. Glyphs with encodings outside 0 to 0xFFFF are kept but
+        cannot be looked up by encoding. See 'dump_pcf_to_bytes' for the parameters.
+        """
+        with open(file_path, 'wb') as file:
+            file.write(self.dump_pcf_to_bytes(glyph_pad, msb_first))
+
+    def save(self, file_path: str | PathLike[str], stats: BdfStats | None = None):
+        """
+        Writes the font as UTF-8 with LF line endings on every platform.
+        Lazy glyphs that have not changed are copied from the loaded file as they are, keeping the formatting of the
+        source, such as 'ENCODING   106'. A font with lazy glyphs is written through a temporary file that replaces
+        the target, so it can be saved over the file it was loaded from.
+
+        :param file_path:
+            The path of the font file to write.
+        :param stats:
+            Add the seconds spent in each phase and the counts of what was dumped to this object, see 'BdfStats'.
+        """
+        if not any(isinstance(glyph, _LazyBdfGlyph) for glyph in self.glyphs):
+            with open(file_path, 'wb') as file:
+                _dump_file(file, self, stats)
+            return
+
+        with _replace_file(file_path) as file:
+            _dump_file(file, self, stats)
+            _release_mapping_of(self.glyphs, file_path)
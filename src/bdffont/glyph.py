@@ -1,7 +1,176 @@
-from typing import Any
+import binascii
+import marshal
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable
+from functools import reduce
+from itertools import compress
+from operator import add, attrgetter, or_
+from typing import TYPE_CHECKING, Any, SupportsIndex
+
+if TYPE_CHECKING:
+    import numpy as np
+
+_BITS_TO_DIGITS = b'01' + b'x' * 254
+_DIGITS_TO_BITS = bytes.maketrans(b'01', b'\x00\x01')
+_TAIL_MASK_TABLES = [bytes(value & (0xFF << (8 - bits)) & 0xFF for value in range(256)) for bits in range(8)]
+
+
+def _pack_bitmap(bitmap: list[list[int]], width: int) -> bytes:
+    stride = (width + 7) // 8
+    if stride == 0:
+        return b''
+    bitmap_width = stride * 8
+    data = bytearray()
+    for bitmap_row in bitmap:
+        if len(bitmap_row) < bitmap_width:
+            bitmap_row = bitmap_row + [0] * (bitmap_width - len(bitmap_row))
+        elif len(bitmap_row) > bitmap_width:
+            bitmap_row = bitmap_row[:bitmap_width]
+        try:
+            bin_string = bytes(bitmap_row).translate(_BITS_TO_DIGITS)
+        except ValueError:
+            bin_string = ''.join(map(str, bitmap_row))
+        data += int(bin_string, 2).to_bytes(stride, 'big')
+    return bytes(data)
+
+
+def _unpack_bitmap(data: bytes, width: int) -> list[list[int]]:
+    stride = (width + 7) // 8
+    if stride == 0 or len(data) == 0:
+        return []
+    bitmap_width = stride * 8
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b').encode().translate(_DIGITS_TO_BITS)
+    return [list(bits[start:start + width]) for start in range(0, len(bits), bitmap_width)]
+
+
+def _decode_hex_bitmap(words: list[str | bytes], width: int) -> bytes:
+    stride = (width + 7) // 8
+    data = None
+    if set(map(len, words)) == {stride * 2}:
+        try:
+            data = binascii.a2b_hex(b''.join(words) if isinstance(words[0], bytes) else ''.join(words))
+        except (TypeError, ValueError):
+            pass
+    if data is None:
+        data = bytearray()
+        bitmap_width = stride * 8
+        for word in words:
+            value = int(word, 16)
+            word_width = len(word) * 4
+            if word_width < bitmap_width:
+                value <<= bitmap_width - word_width
+            elif word_width > bitmap_width:
+                value >>= word_width - bitmap_width
+            data += value.to_bytes(stride, 'big')
+    return _mask_bitmap_tail(data, width)
+
+
+def _mask_bitmap_tail(data: bytes | bytearray, width: int) -> bytes:
+    """
+    Clears the bits past the width in the last byte of each row.
+    """
+    if width % 8 != 0:
+        stride = (width + 7) // 8
+        tails = data[stride - 1::stride]
+        masked_tails = tails.translate(_TAIL_MASK_TABLES[width % 8])
+        if masked_tails != tails:
+            data = bytearray(data)
+            data[stride - 1::stride] = masked_tails
+    return bytes(data)
+
+
+def _fit_bitmap(data: bytes, width: int, height: int) -> bytes:
+    """
+    Cuts or pads a packed bitmap with empty rows to the height, and clears the bits past the width.
+    """
+    size = (width + 7) // 8 * height
+    if len(data) != size:
+        data = data[:size] + bytes(max(size - len(data), 0))
+    return _mask_bitmap_tail(data, width)
+
+
+def _restride_bitmap(data: bytes, stride: int, new_stride: int) -> bytes:
+    """
+    Cuts or pads each row of a packed bitmap on the right to a new number of bytes.
+    """
+    if new_stride == stride:
+        return data
+    result = bytearray(len(data) // stride * new_stride)
+    for column in range(min(stride, new_stride)):
+        result[column::new_stride] = data[column::stride]
+    return bytes(result)
+
+
+def _shift_bitmap(data: bytes, shift: int) -> bytes:
+    """
+    Shifts all bits of a packed bitmap as if its rows were one line, to the left if the shift is positive and to
+    the right if negative. The bits that cross from one row into the next must be cleared by the caller.
+    """
+    value = int.from_bytes(data, 'big')
+    value = value << shift if shift >= 0 else value >> -shift
+    return (value & ((1 << len(data) * 8) - 1)).to_bytes(len(data), 'big')
+
+
+def _encode_hex_bitmap(data: bytes, width: int) -> str:
+    stride = (width + 7) // 8
+    if stride == 0 or len(data) == 0:
+        return ''
+    if len(data) % stride != 0:
+        data = data + bytes(stride - len(data) % stride)
+    return data.hex('\n', stride).upper() + '\n'
 
 
 class BdfGlyph:
+    # A font holds tens of thousands of glyphs, and slots take a fraction of the memory of an instance dict.
+    __slots__ = (
+        'name',
+        'encoding',
+        'scalable_width_x',
+        'scalable_width_y',
+        'device_width_x',
+        'device_width_y',
+        'width',
+        'height',
+        'offset_x',
+        'offset_y',
+        '_comments',
+        '_bitmap',
+        '_bitmap_data',
+        '_bitmap_width',
+        '__weakref__',
+    )
+
+    @staticmethod
+    def from_numpy(
+            bitmap: 'np.ndarray',
+            name: str,
+            encoding: int,
+            scalable_width: tuple[int, int] = (0, 0),
+            device_width: tuple[int, int] = (0, 0),
+            offset: tuple[int, int] = (0, 0),
+            comments: list[str] | None = None,
+    ) -> 'BdfGlyph':
+        """
+        Creates a glyph from a 2D array of pixels, where any non-zero value is set. The shape of the array is
+        the size of the bounding box. Requires NumPy.
+        """
+        import numpy as np
+
+        height, width = bitmap.shape
+        bitmap_data = np.packbits(np.asarray(bitmap) != 0, axis=1).tobytes()
+        return BdfGlyph(
+            name,
+            encoding,
+            scalable_width,
+            device_width,
+            (width, height, offset[0], offset[1]),
+            None,
+            comments,
+            bitmap_data,
+        )
+
     name: str
     encoding: int
     scalable_width_x: int
@@ -12,8 +181,10 @@ class BdfGlyph:
     height: int
     offset_x: int
     offset_y: int
-    bitmap: list[list[int]]
-    comments: list[str]
+    _comments: list[str] | None
+    _bitmap: list[list[int]] | None
+    _bitmap_data: bytes | None
+    _bitmap_width: int
 
     def __init__(
             self,
@@ -24,6 +195,7 @@ class BdfGlyph:
             bounding_box: tuple[int, int, int, int] = (0, 0, 0, 0),
             bitmap: list[list[int]] | None = None,
             comments: list[str] | None = None,
+            bitmap_data: bytes | None = None,
     ):
         """
         :param name:
@@ -55,14 +227,20 @@ class BdfGlyph:
             The bitmap of the glyph.
         :param comments:
             The comments.
+        :param bitmap_data:
+            The packed bitmap of the glyph. Each row takes 'ceil(width / 8)' bytes, most significant bit first,
+            the same as the hex rows in the BDF file. Takes precedence over 'bitmap'.
         """
         self.name = name
         self.encoding = encoding
         self.scalable_width_x, self.scalable_width_y = scalable_width
         self.device_width_x, self.device_width_y = device_width
         self.width, self.height, self.offset_x, self.offset_y = bounding_box
-        self.bitmap = [] if bitmap is None else bitmap
-        self.comments = [] if comments is None else comments
+        if bitmap_data is not None:
+            self.bitmap_data = bitmap_data
+        else:
+            self.bitmap = [] if bitmap is None else bitmap
+        self._comments = comments
 
     def __eq__(self, other: Any) -> bool:
         if not isinstance(other, BdfGlyph):
@@ -77,8 +255,88 @@ class BdfGlyph:
                 self.height == other.height and
                 self.offset_x == other.offset_x and
                 self.offset_y == other.offset_y and
-                self.bitmap == other.bitmap and
-                self.comments == other.comments)
+                self._bitmap_equals(other) and
+                (self._comments or []) == (other._comments or []))
+
+    def _bitmap_equals(self, other: 'BdfGlyph') -> bool:
+        if self._bitmap is None and other._bitmap is None:
+            if self._bitmap_width == other._bitmap_width or self._bitmap_data == other._bitmap_data == b'':
+                return self._bitmap_data == other._bitmap_data
+        return self._get_bitmap_view() == other._get_bitmap_view()
+
+    def _get_bitmap_view(self) -> list[list[int]]:
+        if self._bitmap is not None:
+            return self._bitmap
+        return _unpack_bitmap(self._bitmap_data, self._bitmap_width)
+
+    @property
+    def comments(self) -> list[str]:
+        """
+        The comments. The list is created on first access, so that glyphs without comments do not hold one.
+        """
+        if self._comments is None:
+            self._comments = []
+        return self._comments
+
+    @comments.setter
+    def comments(self, value: list[str]):
+        self._comments = value
+
+    @property
+    def bitmap(self) -> list[list[int]]:
+        """
+        The bitmap of the glyph as rows of 0 and 1.
+        Built from the packed data on first access, after which the list becomes the source of the bitmap.
+        """
+        if self._bitmap is None:
+            self._bitmap = _unpack_bitmap(self._bitmap_data, self._bitmap_width)
+            self._bitmap_data = None
+        return self._bitmap
+
+    @bitmap.setter
+    def bitmap(self, value: list[list[int]]):
+        self._bitmap = value
+        self._bitmap_data = None
+
+    @property
+    def bitmap_data(self) -> bytes:
+        """
+        The packed bitmap of the glyph, with 'bitmap_stride' bytes per row.
+        """
+        if self._bitmap is not None:
+            return _pack_bitmap(self._bitmap, self.width)
+        if self._bitmap_width != self.width:
+            return _pack_bitmap(_unpack_bitmap(self._bitmap_data, self._bitmap_width), self.width)
+        return self._bitmap_data
+
+    @bitmap_data.setter
+    def bitmap_data(self, value: bytes):
+        self._bitmap = None
+        self._bitmap_data = _mask_bitmap_tail(bytes(value), self.width)
+        self._bitmap_width = self.width
+
+    @property
+    def bitmap_stride(self) -> int:
+        return (self.width + 7) // 8
+
+    def to_numpy(self, packed: bool = False) -> 'np.ndarray':
+        """
+        The bitmap as a 2D uint8 array of 0 and 1 with one column per pixel. Requires NumPy.
+
+        :param packed:
+            Return the packed rows instead, with 'bitmap_stride' bytes per row. This is a read-only view of the
+            packed data, without a copy.
+        """
+        import numpy as np
+
+        stride = self.bitmap_stride
+        if stride == 0:
+            return np.zeros((0, 0), np.uint8)
+        rows = np.frombuffer(self.bitmap_data, np.uint8)
+        rows = rows[:len(rows) // stride * stride].reshape(-1, stride)
+        if packed:
+            return rows
+        return np.unpackbits(rows, axis=1, count=self.width)
 
     @property
     def scalable_width(self) -> tuple[int, int]:
@@ -119,3 +377,354 @@ class BdfGlyph:
     @bounding_box.setter
     def bounding_box(self, value: tuple[int, int, int, int]):
         self.width, self.height, self.offset_x, self.offset_y = value
+
+    def crop(self):
+        """
+        Shrinks the bounding box and the bitmap to the pixels that are set. A glyph without any set pixels gets
+        an empty bounding box.
+        """
+        stride = self.bitmap_stride
+        data = _fit_bitmap(self.bitmap_data, self.width, self.height)
+        ink = data.strip(b'\x00')
+        if len(ink) == 0:
+            self.bounding_box = 0, 0, 0, 0
+            self.bitmap_data = b''
+            return
+        top = (len(data) - len(data.lstrip(b'\x00'))) // stride
+        bottom = self.height - (len(data) - len(data.rstrip(b'\x00'))) // stride
+        data = data[top * stride:bottom * stride]
+
+        # The columns with set pixels, from the bytes of each column merged across the rows.
+        mask = int.from_bytes(bytes([reduce(or_, data[column::stride]) for column in range(stride)]), 'big')
+        left = stride * 8 - mask.bit_length()
+        width = mask.bit_length() - (mask & -mask).bit_length() + 1
+
+        data = _mask_bitmap_tail(_restride_bitmap(_shift_bitmap(data, left), stride, (width + 7) // 8), width)
+        self.bounding_box = width, bottom - top, self.offset_x + left, self.offset_y + self.height - bottom
+        self.bitmap_data = data
+
+    def pad(self, bounding_box: tuple[int, int, int, int]):
+        """
+        Grows the bounding box and the bitmap to the given bounding box, which must contain the current one unless
+        it is empty.
+        """
+        width, height, offset_x, offset_y = bounding_box
+        stride = (width + 7) // 8
+        if self.width == 0 or self.height == 0:
+            data = bytes(stride * height)
+        else:
+            left = self.offset_x - offset_x
+            right = offset_x + width - self.offset_x - self.width
+            bottom = self.offset_y - offset_y
+            top = offset_y + height - self.offset_y - self.height
+            if min(left, right, bottom, top) < 0:
+                raise ValueError(f'glyph {repr(self.name)} is outside the bounding box: {bounding_box}')
+            data = _fit_bitmap(self.bitmap_data, self.width, self.height)
+            data = _shift_bitmap(_restride_bitmap(data, self.bitmap_stride, stride), -left)
+            data = bytes(stride * top) + data + bytes(stride * bottom)
+        self.bounding_box = bounding_box
+        self.bitmap_data = data
+
+
+def _pack_glyphs(glyphs: Iterable[BdfGlyph]) -> bytes:
+    """
+    Serializes the glyphs column by column, which is much cheaper to transfer between processes than pickling
+    each glyph object.
+    """
+    names = []
+    comments = []
+    metrics = array('q')
+    bitmap_sizes = array('q')
+    bitmaps = []
+    for glyph in glyphs:
+        names.append(glyph.name)
+        comments.append(glyph._comments or None)
+        metrics.extend((
+            glyph.encoding,
+            glyph.scalable_width_x,
+            glyph.scalable_width_y,
+            glyph.device_width_x,
+            glyph.device_width_y,
+            glyph.width,
+            glyph.height,
+            glyph.offset_x,
+            glyph.offset_y,
+        ))
+        bitmap_data = glyph.bitmap_data
+        bitmap_sizes.append(len(bitmap_data))
+        bitmaps.append(bitmap_data)
+    return marshal.dumps((names, comments, metrics.tobytes(), bitmap_sizes.tobytes(), b''.join(bitmaps)))
+
+
+def _unpack_glyphs(data: bytes) -> list[BdfGlyph]:
+    names, comments, metrics_data, bitmap_sizes_data, bitmaps = marshal.loads(data)
+    metrics = array('q')
+    metrics.frombytes(metrics_data)
+    bitmap_sizes = array('q')
+    bitmap_sizes.frombytes(bitmap_sizes_data)
+    glyphs = []
+    start = 0
+    rows = zip(*[iter(metrics.tolist())] * 9)
+    for name, glyph_comments, bitmap_size, row in zip(names, comments, bitmap_sizes, rows):
+        encoding, swx, swy, dwx, dwy, width, height, offset_x, offset_y = row
+        glyphs.append(BdfGlyph(
+            name,
+            encoding,
+            (swx, swy),
+            (dwx, dwy),
+            (width, height, offset_x, offset_y),
+            None,
+            glyph_comments,
+            bitmaps[start:start + bitmap_size],
+        ))
+        start += bitmap_size
+    return glyphs
+
+
+class _GlyphMetrics:
+    """
+    The glyph metrics that a font derives its own from. Each value is kept as a count of the glyphs that have it,
+    so that glyphs can be added and removed without a rescan. Only glyphs with a non-empty bounding box count
+    towards the edges.
+    """
+
+    count: int
+    advances_total: int
+    overflows: int
+    lefts: Counter[int]
+    bottoms: Counter[int]
+    rights: Counter[int]
+    tops: Counter[int]
+    advances: Counter[int]
+
+    def __init__(self, glyphs: Iterable[BdfGlyph] = ()):
+        self.count = 0
+        self.advances_total = 0
+        self.overflows = 0
+        self.lefts = Counter()
+        self.bottoms = Counter()
+        self.rights = Counter()
+        self.tops = Counter()
+        self.advances = Counter()
+        self.add(glyphs)
+
+    def _update(self, glyphs: Iterable[BdfGlyph], sign: int):
+        glyphs = list(glyphs)
+        advances = list(map(attrgetter('device_width_x'), glyphs))
+        inked = [glyph.width > 0 and glyph.height > 0 for glyph in glyphs]
+        lefts = list(compress(map(attrgetter('offset_x'), glyphs), inked))
+        bottoms = list(compress(map(attrgetter('offset_y'), glyphs), inked))
+        rights = list(map(add, lefts, compress(map(attrgetter('width'), glyphs), inked)))
+        tops = list(map(add, bottoms, compress(map(attrgetter('height'), glyphs), inked)))
+        overflows = sum([
+            left < 0 or right > advance for left, right, advance in zip(lefts, rights, compress(advances, inked))
+        ])
+
+        self.count += len(glyphs) * sign
+        self.advances_total += sum(map(abs, advances)) * sign
+        self.overflows += overflows * sign
+        for counter, values in (
+                (self.lefts, lefts),
+                (self.bottoms, bottoms),
+                (self.rights, rights),
+                (self.tops, tops),
+                (self.advances, advances),
+        ):
+            if sign > 0:
+                counter.update(values)
+            else:
+                counter.subtract(values)
+                for value in set(values):
+                    if counter[value] <= 0:
+                        del counter[value]
+
+    def add(self, glyphs: Iterable[BdfGlyph]):
+        self._update(glyphs, 1)
+
+    def remove(self, glyphs: Iterable[BdfGlyph]):
+        self._update(glyphs, -1)
+
+    @property
+    def bounding_box(self) -> tuple[int, int, int, int]:
+        if len(self.lefts) == 0:
+            return 0, 0, 0, 0
+        left = min(self.lefts)
+        bottom = min(self.bottoms)
+        return max(self.rights) - left, max(self.tops) - bottom, left, bottom
+
+    @property
+    def average_width(self) -> int:
+        """
+        The mean of the absolute device widths in tenths of pixels, as in XLFD 'AVERAGE_WIDTH'.
+        """
+        if self.count == 0:
+            return 0
+        return round(self.advances_total * 10 / self.count)
+
+    @property
+    def spacing(self) -> str:
+        """
+        'C' if all glyphs share a device width and draw inside it, 'M' if they only share a device width,
+        else 'P', as in XLFD 'SPACING'.
+        """
+        if len(self.advances) > 1:
+            return 'P'
+        return 'C' if self.overflows == 0 else 'M'
+
+
+class BdfGlyphList(list[BdfGlyph]):
+    """
+    A list of glyphs with indexes by encoding and by name. The indexes are built on first lookup and dropped by
+    any change to the list. If a glyph in the list changes its encoding or name, call 'reindex'.
+    When several glyphs share an encoding or a name, the first one in the list is found.
+    Once 'track_metrics' is called, the metrics of the glyphs are also kept up to date as glyphs are added and
+    removed. If a glyph in the list changes its metrics, call 'track_metrics' again.
+    """
+
+    _encoding_index: dict[int, BdfGlyph] | None
+    _name_index: dict[str, BdfGlyph] | None
+    _sorted_encodings: list[int] | None
+    _metrics: _GlyphMetrics | None
+
+    def __init__(self, glyphs: Iterable[BdfGlyph] = ()):
+        super().__init__(glyphs)
+        self.reindex()
+        self._metrics = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return type(self), (list(self),)
+
+    def reindex(self):
+        self._encoding_index = None
+        self._name_index = None
+        self._sorted_encodings = None
+
+    def _get_encoding_index(self) -> dict[int, BdfGlyph]:
+        if self._encoding_index is None:
+            glyphs = self[::-1]
+            self._encoding_index = dict(zip(map(attrgetter('encoding'), glyphs), glyphs))
+        return self._encoding_index
+
+    def _get_name_index(self) -> dict[str, BdfGlyph]:
+        if self._name_index is None:
+            glyphs = self[::-1]
+            self._name_index = dict(zip(map(attrgetter('name'), glyphs), glyphs))
+        return self._name_index
+
+    def get_by_encoding(self, encoding: int) -> BdfGlyph | None:
+        glyph = self._get_encoding_index().get(encoding, None)
+        if glyph is not None and glyph.encoding != encoding:
+            self.reindex()
+            glyph = self._get_encoding_index().get(encoding, None)
+        return glyph
+
+    def get_by_name(self, name: str) -> BdfGlyph | None:
+        glyph = self._get_name_index().get(name, None)
+        if glyph is not None and glyph.name != name:
+            self.reindex()
+            glyph = self._get_name_index().get(name, None)
+        return glyph
+
+    @property
+    def sorted_encodings(self) -> list[int]:
+        """
+        The distinct encodings of the glyphs in ascending order. Do not modify the returned list.
+        """
+        if self._sorted_encodings is None:
+            self._sorted_encodings = sorted(self._get_encoding_index())
+        return self._sorted_encodings
+
+    def get_in_range(self, start: int, stop: int) -> list[BdfGlyph]:
+        """
+        The glyphs with 'start <= encoding < stop', in ascending order of encoding.
+        """
+        encodings = self.sorted_encodings
+        index = self._get_encoding_index()
+        return [index[encoding] for encoding in encodings[bisect_left(encodings, start):bisect_left(encodings, stop)]]
+
+    def track_metrics(self) -> _GlyphMetrics:
+        self._metrics = _GlyphMetrics(self)
+        return self._metrics
+
+    def append(self, glyph: BdfGlyph):
+        super().append(glyph)
+        if self._metrics is not None:
+            self._metrics.add((glyph,))
+        if self._encoding_index is not None and glyph.encoding not in self._encoding_index:
+            self._encoding_index[glyph.encoding] = glyph
+            self._sorted_encodings = None
+        if self._name_index is not None and glyph.name not in self._name_index:
+            self._name_index[glyph.name] = glyph
+
+    def extend(self, glyphs: Iterable[BdfGlyph]):
+        if self._metrics is not None:
+            glyphs = list(glyphs)
+            self._metrics.add(glyphs)
+        super().extend(glyphs)
+        self.reindex()
+
+    def insert(self, index: SupportsIndex, glyph: BdfGlyph):
+        super().insert(index, glyph)
+        self.reindex()
+        if self._metrics is not None:
+            self._metrics.add((glyph,))
+
+    def pop(self, index: SupportsIndex = -1) -> BdfGlyph:
+        glyph = super().pop(index)
+        self.reindex()
+        if self._metrics is not None:
+            self._metrics.remove((glyph,))
+        return glyph
+
+    def remove(self, glyph: BdfGlyph):
+        super().remove(glyph)
+        self.reindex()
+        if self._metrics is not None:
+            self._metrics.remove((glyph,))
+
+    def clear(self):
+        super().clear()
+        self.reindex()
+        if self._metrics is not None:
+            self._metrics = _GlyphMetrics()
+
+    def sort(self, *args: Any, **kwargs: Any):
+        super().sort(*args, **kwargs)
+        self.reindex()
+
+    def reverse(self):
+        super().reverse()
+        self.reindex()
+
+    def __setitem__(self, index: Any, value: Any):
+        if self._metrics is not None:
+            if isinstance(index, slice):
+                value = list(value)
+                removed = self[index]
+                added = value
+            else:
+                removed = (self[index],)
+                added = (value,)
+            super().__setitem__(index, value)
+            self._metrics.remove(removed)
+            self._metrics.add(added)
+        else:
+            super().__setitem__(index, value)
+        self.reindex()
+
+    def __delitem__(self, index: Any):
+        if self._metrics is not None:
+            self._metrics.remove(self[index] if isinstance(index, slice) else (self[index],))
+        super().__delitem__(index)
+        self.reindex()
+
+    def __iadd__(self, glyphs: Iterable[BdfGlyph]) -> 'BdfGlyphList':
+        self.extend(glyphs)
+        return self
+
+    def __imul__(self, count: SupportsIndex) -> 'BdfGlyphList':
+        super().__imul__(count)
+        self.reindex()
+        if self._metrics is not None:
+            self.track_metrics()
+        return self
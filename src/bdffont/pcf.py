@@ -0,0 +1,541 @@
+import mmap
+import struct
+from array import array
+from os import PathLike
+from typing import TYPE_CHECKING
+
+from bdffont.error import BdfParseError, BdfDumpError
+from bdffont.glyph import BdfGlyph, _mask_bitmap_tail
+from bdffont.properties import BdfProperties
+
+if TYPE_CHECKING:
+    from bdffont.font import BdfFont
+
+_PCF_MAGIC = b'\x01fcp'
+
+_PCF_PROPERTIES = 1 << 0
+_PCF_ACCELERATORS = 1 << 1
+_PCF_METRICS = 1 << 2
+_PCF_BITMAPS = 1 << 3
+_PCF_INK_METRICS = 1 << 4
+_PCF_BDF_ENCODINGS = 1 << 5
+_PCF_SWIDTHS = 1 << 6
+_PCF_GLYPH_NAMES = 1 << 7
+_PCF_BDF_ACCELERATORS = 1 << 8
+
+_PCF_TABLE_NAMES = {
+    _PCF_PROPERTIES: 'PROPERTIES',
+    _PCF_ACCELERATORS: 'ACCELERATORS',
+    _PCF_METRICS: 'METRICS',
+    _PCF_BITMAPS: 'BITMAPS',
+    _PCF_INK_METRICS: 'INK_METRICS',
+    _PCF_BDF_ENCODINGS: 'BDF_ENCODINGS',
+    _PCF_SWIDTHS: 'SWIDTHS',
+    _PCF_GLYPH_NAMES: 'GLYPH_NAMES',
+    _PCF_BDF_ACCELERATORS: 'BDF_ACCELERATORS',
+}
+
+_PCF_DEFAULT_FORMAT = 0x00000000
+_PCF_COMPRESSED_METRICS = 0x00000100
+_PCF_FORMAT_MASK = 0xFFFFFF00
+
+_PCF_GLYPH_PAD_MASK = 3 << 0
+_PCF_BYTE_MASK = 1 << 2
+_PCF_BIT_MASK = 1 << 3
+_PCF_SCAN_UNIT_MASK = 3 << 4
+
+_PCF_NO_GLYPH = 0xFFFF
+
+_REVERSE_BITS = bytes(int(f'{value:08b}'[::-1], 2) for value in range(256))
+_SCAN_UNIT_TYPECODES = {2: 'H', 4: 'I', 8: 'Q'}
+
+# The metrics of a glyph: left side bearing, right side bearing, character width, ascent, descent and attributes.
+_Metrics = tuple[int, int, int, int, int, int]
+
+_KEY_FONT = 'FONT'
+_KEY_POINT_SIZE = 'POINT_SIZE'
+_KEY_RESOLUTION_X = 'RESOLUTION_X'
+_KEY_RESOLUTION_Y = 'RESOLUTION_Y'
+
+
+def _get_metrics(glyph: BdfGlyph) -> _Metrics:
+    return (
+        glyph.offset_x,
+        glyph.offset_x + glyph.width,
+        glyph.device_width_x,
+        glyph.offset_y + glyph.height,
+        -glyph.offset_y,
+        0,
+    )
+
+
+def _get_row_size(width: int, glyph_pad: int) -> int:
+    return (width + glyph_pad * 8 - 1) // (glyph_pad * 8) * glyph_pad
+
+
+class PcfReader:
+    """
+    Reads a PCF font. The header tables are read up front, and each glyph is decoded on request, so that single
+    glyphs can be looked up through the encoding table without decoding the others.
+    """
+
+    @staticmethod
+    def load(file_path: str | PathLike[str]) -> 'PcfReader':
+        with open(file_path, 'rb') as file:
+            return PcfReader(file.read())
+
+    buffer: bytes | mmap.mmap
+    name: str
+    point_size: int
+    resolution_x: int
+    resolution_y: int
+    bounding_box: tuple[int, int, int, int]
+    properties: BdfProperties
+    glyphs_count: int
+
+    def __init__(self, buffer: bytes | mmap.mmap):
+        """
+        :param buffer:
+            The content of the font file.
+        """
+        self.buffer = buffer
+        if buffer[:4] != _PCF_MAGIC:
+            raise BdfParseError('not a pcf file')
+        self._tables = {}
+        try:
+            (tables_count,) = struct.unpack_from('<i', buffer, 4)
+            for index in range(tables_count):
+                table_type, table_format, size, offset = struct.unpack_from('<iiii', buffer, 8 + index * 16)
+                self._tables[table_type] = table_format, offset
+            self._read_properties()
+            self._read_metrics_header()
+            self._read_bitmaps_header()
+            self._read_encodings_header()
+            self._read_swidths_header()
+            self._read_glyph_names_header()
+            self._read_bounding_box()
+        except (struct.error, IndexError, ValueError) as e:
+            raise BdfParseError('truncated or damaged pcf file') from e
+        self._encodings = None
+
+    def _open_table(self, table_type: int, required: bool = True) -> tuple[int, str, int] | None:
+        """
+        Returns the format, the byte order for 'struct' and the position after the format.
+        """
+        if table_type not in self._tables:
+            if required:
+                raise BdfParseError(f'missing pcf table: {_PCF_TABLE_NAMES[table_type]}')
+            return None
+        _, offset = self._tables[table_type]
+        (table_format,) = struct.unpack_from('<i', self.buffer, offset)
+        return table_format, '>' if table_format & _PCF_BYTE_MASK else '<', offset + 4
+
+    def _read_properties(self):
+        self.properties = BdfProperties()
+        self.name = ''
+        table = self._open_table(_PCF_PROPERTIES, False)
+        if table is not None:
+            _, endian, position = table
+            (count,) = struct.unpack_from(f'{endian}i', self.buffer, position)
+            position += 4
+            entries = [struct.unpack_from(f'{endian}ibi', self.buffer, position + index * 9) for index in range(count)]
+            position += count * 9 + (4 - count % 4) % 4
+            (strings_size,) = struct.unpack_from(f'{endian}i', self.buffer, position)
+            strings = bytes(self.buffer[position + 4:position + 4 + strings_size])
+            data = {}
+            for name_offset, is_string, value in entries:
+                key = strings[name_offset:strings.index(b'\0', name_offset)].decode('utf-8')
+                if is_string:
+                    value = strings[value:strings.index(b'\0', value)].decode('utf-8')
+                if key == _KEY_FONT:
+                    self.name = value
+                else:
+                    data[key] = value
+            self.properties.update_bulk(data)
+        point_size = self.properties.get(_KEY_POINT_SIZE, None)
+        self.point_size = 0 if point_size is None else round(point_size / 10)
+        self.resolution_x = self.properties.get(_KEY_RESOLUTION_X, 0)
+        self.resolution_y = self.properties.get(_KEY_RESOLUTION_Y, 0)
+
+    def _read_metrics_header(self):
+        table_format, endian, position = self._open_table(_PCF_METRICS)
+        self._metrics_compressed = table_format & _PCF_FORMAT_MASK == _PCF_COMPRESSED_METRICS
+        if self._metrics_compressed:
+            (self.glyphs_count,) = struct.unpack_from(f'{endian}h', self.buffer, position)
+            self._metrics_position = position + 2
+        else:
+            (self.glyphs_count,) = struct.unpack_from(f'{endian}i', self.buffer, position)
+            self._metrics_position = position + 4
+            self._metrics_format = f'{endian}hhhhhH'
+
+    def _read_metrics(self, index: int) -> _Metrics:
+        if self._metrics_compressed:
+            position = self._metrics_position + index * 5
+            values = self.buffer[position:position + 5]
+            return values[0] - 0x80, values[1] - 0x80, values[2] - 0x80, values[3] - 0x80, values[4] - 0x80, 0
+        return struct.unpack_from(self._metrics_format, self.buffer, self._metrics_position + index * 12)
+
+    def _read_bitmaps_header(self):
+        table_format, endian, position = self._open_table(_PCF_BITMAPS)
+        (count,) = struct.unpack_from(f'{endian}i', self.buffer, position)
+        if count != self.glyphs_count:
+            raise BdfParseError(f'the count of pcf bitmaps is incorrect: {self.glyphs_count} -> {count}')
+        self._bitmap_offsets = struct.unpack_from(f'{endian}{count}i', self.buffer, position + 4)
+        self._bitmaps_position = position + 4 + count * 4 + 16
+        self._glyph_pad = 1 << (table_format & _PCF_GLYPH_PAD_MASK)
+        self._scan_unit = 1 << ((table_format & _PCF_SCAN_UNIT_MASK) >> 4)
+        self._bit_msb_first = table_format & _PCF_BIT_MASK != 0
+        self._byte_msb_first = table_format & _PCF_BYTE_MASK != 0
+
+    def _read_bitmap(self, index: int, width: int, height: int) -> bytes:
+        row_size = _get_row_size(width, self._glyph_pad)
+        start = self._bitmaps_position + self._bitmap_offsets[index]
+        data = self.buffer[start:start + row_size * height]
+        if len(data) < row_size * height:
+            raise IndexError(f'bitmap out of range: {index}')
+        if not self._bit_msb_first:
+            data = data.translate(_REVERSE_BITS)
+        if self._bit_msb_first != self._byte_msb_first and self._scan_unit > 1:
+            units = array(_SCAN_UNIT_TYPECODES[self._scan_unit], data)
+            units.byteswap()
+            data = units.tobytes()
+        stride = (width + 7) // 8
+        if row_size != stride:
+            data = b''.join([data[row * row_size:row * row_size + stride] for row in range(height)])
+        return _mask_bitmap_tail(data, width)
+
+    def _read_encodings_header(self):
+        _, endian, position = self._open_table(_PCF_BDF_ENCODINGS)
+        self._encodings_format = f'{endian}H'
+        min_byte2, max_byte2, min_byte1, max_byte1, self.default_char = struct.unpack_from(
+            f'{endian}HHHHH',
+            self.buffer,
+            position,
+        )
+        self._min_byte2 = min_byte2
+        self._min_byte1 = min_byte1
+        self._columns_count = max_byte2 - min_byte2 + 1
+        self._rows_count = max_byte1 - min_byte1 + 1
+        self._encodings_position = position + 10
+
+    def _read_swidths_header(self):
+        table = self._open_table(_PCF_SWIDTHS, False)
+        if table is None:
+            self._swidths_position = None
+        else:
+            _, endian, position = table
+            self._swidths_format = f'{endian}i'
+            self._swidths_position = position + 4
+
+    def _read_glyph_names_header(self):
+        table = self._open_table(_PCF_GLYPH_NAMES, False)
+        if table is None:
+            self._names_position = None
+        else:
+            _, endian, position = table
+            (count,) = struct.unpack_from(f'{endian}i', self.buffer, position)
+            self._names_format = f'{endian}i'
+            self._names_position = position + 4
+            self._names_strings_position = position + 4 + count * 4 + 4
+
+    def _read_bounding_box(self):
+        table = self._open_table(_PCF_BDF_ACCELERATORS, False) or self._open_table(_PCF_ACCELERATORS, False)
+        if table is not None:
+            _, endian, position = table
+            min_bounds = struct.unpack_from(f'{endian}hhhhhH', self.buffer, position + 20)
+            max_bounds = struct.unpack_from(f'{endian}hhhhhH', self.buffer, position + 32)
+        elif self.glyphs_count > 0:
+            all_metrics = [self._read_metrics(index) for index in range(self.glyphs_count)]
+            min_bounds = tuple(map(min, zip(*all_metrics)))
+            max_bounds = tuple(map(max, zip(*all_metrics)))
+        else:
+            min_bounds = max_bounds = 0, 0, 0, 0, 0, 0
+        self.bounding_box = max_bounds[1] - min_bounds[0], max_bounds[3] + max_bounds[4], min_bounds[0], -max_bounds[4]
+
+    def get_glyph_index(self, encoding: int) -> int | None:
+        row = (encoding >> 8) - self._min_byte1
+        column = (encoding & 0xFF) - self._min_byte2
+        if encoding < 0 or not 0 <= row < self._rows_count or not 0 <= column < self._columns_count:
+            return None
+        position = self._encodings_position + (row * self._columns_count + column) * 2
+        try:
+            (index,) = struct.unpack_from(self._encodings_format, self.buffer, position)
+        except struct.error as e:
+            raise BdfParseError('truncated or damaged pcf file') from e
+        if index == _PCF_NO_GLYPH:
+            return None
+        return index
+
+    def _get_encodings(self) -> list[int]:
+        if self._encodings is None:
+            self._encodings = [-1] * self.glyphs_count
+            for row in reversed(range(self._rows_count)):
+                for column in reversed(range(self._columns_count)):
+                    encoding = (row + self._min_byte1) << 8 | (column + self._min_byte2)
+                    index = self.get_glyph_index(encoding)
+                    if index is not None and index < self.glyphs_count:
+                        self._encodings[index] = encoding
+        return self._encodings
+
+    def _read_glyph_name(self, index: int, encoding: int) -> str:
+        if self._names_position is None:
+            return f'uni{encoding:04X}' if encoding >= 0 else f'glyph{index}'
+        (offset,) = struct.unpack_from(self._names_format, self.buffer, self._names_position + index * 4)
+        start = self._names_strings_position + offset
+        return bytes(self.buffer[start:self.buffer.find(b'\0', start)]).decode('utf-8')
+
+    def read_glyph(self, index: int, encoding: int | None = None) -> BdfGlyph:
+        """
+        Decodes the glyph at the index in the file. The encoding is looked up if not given.
+        """
+        if not 0 <= index < self.glyphs_count:
+            raise IndexError(f'glyph index out of range: {index}')
+        if encoding is None:
+            encoding = self._get_encodings()[index]
+        try:
+            return self._read_glyph(index, encoding)
+        except (struct.error, IndexError, ValueError) as e:
+            raise BdfParseError('truncated or damaged pcf file') from e
+
+    def _read_glyph(self, index: int, encoding: int) -> BdfGlyph:
+        left_side_bearing, right_side_bearing, character_width, ascent, descent, _ = self._read_metrics(index)
+        width = right_side_bearing - left_side_bearing
+        height = ascent + descent
+        if self._swidths_position is None:
+            scalable_width_x = 0
+        else:
+            position = self._swidths_position + index * 4
+            (scalable_width_x,) = struct.unpack_from(self._swidths_format, self.buffer, position)
+        return BdfGlyph(
+            self._read_glyph_name(index, encoding),
+            encoding,
+            (scalable_width_x, 0),
+            (character_width, 0),
+            (width, height, left_side_bearing, -descent),
+            None,
+            None,
+            self._read_bitmap(index, width, height),
+        )
+
+    def get_glyph(self, encoding: int) -> BdfGlyph | None:
+        index = self.get_glyph_index(encoding)
+        if index is None:
+            return None
+        return self.read_glyph(index, encoding)
+
+    def read_glyphs(self) -> list[BdfGlyph]:
+        encodings = self._get_encodings()
+        return [self.read_glyph(index, encodings[index]) for index in range(self.glyphs_count)]
+
+
+def _pack_table(table_format: int, *chunks: bytes) -> bytes:
+    data = struct.pack('<i', table_format) + b''.join(chunks)
+    return data + bytes((4 - len(data) % 4) % 4)
+
+
+def _pack_strings(strings: bytearray, value: str) -> int:
+    offset = len(strings)
+    strings += value.encode('utf-8') + b'\0'
+    return offset
+
+
+def _dump_properties_table(font: 'BdfFont', table_format: int, endian: str) -> bytes:
+    items = list(font.properties.items())
+    if _KEY_FONT not in font.properties:
+        items.insert(0, (_KEY_FONT, font.name))
+    strings = bytearray()
+    entries = []
+    for key, value in items:
+        name_offset = _pack_strings(strings, key)
+        if isinstance(value, str):
+            entries.append(struct.pack(f'{endian}ibi', name_offset, 1, _pack_strings(strings, value)))
+        else:
+            if not -0x80000000 <= value <= 0x7FFFFFFF:
+                raise BdfDumpError(f'properties value out of range: {key} = {value}')
+            entries.append(struct.pack(f'{endian}ibi', name_offset, 0, value))
+    return _pack_table(
+        table_format,
+        struct.pack(f'{endian}i', len(entries)),
+        *entries,
+        bytes((4 - len(entries) % 4) % 4),
+        struct.pack(f'{endian}i', len(strings)),
+        strings,
+    )
+
+
+def _dump_accelerators_table(
+        font: 'BdfFont',
+        all_metrics: list[_Metrics],
+        table_format: int,
+        endian: str,
+) -> bytes:
+    font_ascent = font.properties.font_ascent
+    if font_ascent is None:
+        font_ascent = font.height + font.offset_y
+    font_descent = font.properties.font_descent
+    if font_descent is None:
+        font_descent = -font.offset_y
+    if len(all_metrics) > 0:
+        min_bounds = tuple(map(min, zip(*all_metrics)))
+        max_bounds = tuple(map(max, zip(*all_metrics)))
+        max_overlap = max(metrics[1] - metrics[2] for metrics in all_metrics)
+    else:
+        min_bounds = max_bounds = 0, 0, 0, 0, 0, 0
+        max_overlap = 0
+    # The same flags as the X server computes for a font.
+    no_overlap = max_overlap <= min_bounds[0]
+    constant_metrics = min_bounds == max_bounds
+    terminal_font = (constant_metrics and
+                     max_bounds[0] == 0 and
+                     max_bounds[1] == max_bounds[2] and
+                     max_bounds[3] == font_ascent and
+                     max_bounds[4] == font_descent)
+    constant_width = min_bounds[2] == max_bounds[2]
+    ink_inside = (min_bounds[0] >= 0 and
+                  max_overlap <= 0 and
+                  min_bounds[3] >= -font_descent and
+                  max_bounds[3] <= font_ascent and
+                  -min_bounds[4] <= font_ascent and
+                  max_bounds[4] <= font_descent)
+    return _pack_table(
+        table_format,
+        struct.pack(
+            f'{endian}8B',
+            no_overlap,
+            constant_metrics,
+            terminal_font,
+            constant_width,
+            ink_inside,
+            False,
+            0,
+            0,
+        ),
+        struct.pack(f'{endian}iii', font_ascent, font_descent, max_overlap),
+        struct.pack(f'{endian}hhhhhH', *min_bounds),
+        struct.pack(f'{endian}hhhhhH', *max_bounds),
+    )
+
+
+def _dump_metrics_table(all_metrics: list[_Metrics], table_format: int, endian: str) -> bytes:
+    if len(all_metrics) <= 0x7FFF and all(-0x80 <= value < 0x80 for metrics in all_metrics for value in metrics[:5]):
+        return _pack_table(
+            table_format | _PCF_COMPRESSED_METRICS,
+            struct.pack(f'{endian}h', len(all_metrics)),
+            bytes(value + 0x80 for metrics in all_metrics for value in metrics[:5]),
+        )
+    try:
+        return _pack_table(
+            table_format,
+            struct.pack(f'{endian}i', len(all_metrics)),
+            *[struct.pack(f'{endian}hhhhhH', *metrics) for metrics in all_metrics],
+        )
+    except struct.error as e:
+        raise BdfDumpError('glyph metrics out of range for pcf') from e
+
+
+def _dump_bitmaps_table(glyphs: list[BdfGlyph], table_format: int, endian: str, glyph_pad: int) -> bytes:
+    offsets = []
+    sizes = [0, 0, 0, 0]
+    data = bytearray()
+    for glyph in glyphs:
+        stride = glyph.bitmap_stride
+        row_size = _get_row_size(glyph.width, glyph_pad)
+        bitmap_data = glyph.bitmap_data
+        offsets.append(len(data))
+        if stride == 0:
+            continue
+        rows = [bitmap_data[start:start + stride] for start in range(0, len(bitmap_data), stride)][:glyph.height]
+        rows.extend([bytes(stride)] * (glyph.height - len(rows)))
+        padding = bytes(row_size - stride)
+        for row in rows:
+            data += row
+            data += padding
+        for pad_index in range(4):
+            sizes[pad_index] += _get_row_size(glyph.width, 1 << pad_index) * glyph.height
+    if not table_format & _PCF_BIT_MASK:
+        data = data.translate(_REVERSE_BITS)
+    return _pack_table(
+        table_format,
+        struct.pack(f'{endian}i', len(glyphs)),
+        struct.pack(f'{endian}{len(offsets)}i', *offsets),
+        struct.pack(f'{endian}iiii', *sizes),
+        data,
+    )
+
+
+def _dump_encodings_table(font: 'BdfFont', glyphs: list[BdfGlyph], table_format: int, endian: str) -> bytes:
+    indexes = {}
+    for index, glyph in enumerate(glyphs):
+        if 0 <= glyph.encoding <= 0xFFFF and glyph.encoding not in indexes:
+            if index >= _PCF_NO_GLYPH:
+                raise BdfDumpError(f'too many glyphs for pcf encodings: {len(glyphs)}')
+            indexes[glyph.encoding] = index
+    if len(indexes) > 0:
+        min_byte2 = min(encoding & 0xFF for encoding in indexes)
+        max_byte2 = max(encoding & 0xFF for encoding in indexes)
+        min_byte1 = min(encoding >> 8 for encoding in indexes)
+        max_byte1 = max(encoding >> 8 for encoding in indexes)
+    else:
+        min_byte2 = max_byte2 = min_byte1 = max_byte1 = 0
+    columns_count = max_byte2 - min_byte2 + 1
+    table = array('H', [_PCF_NO_GLYPH] * (columns_count * (max_byte1 - min_byte1 + 1)))
+    for encoding, index in indexes.items():
+        table[((encoding >> 8) - min_byte1) * columns_count + (encoding & 0xFF) - min_byte2] = index
+    default_char = font.properties.default_char
+    if default_char is None or not 0 <= default_char <= 0xFFFF:
+        default_char = _PCF_NO_GLYPH
+    return _pack_table(
+        table_format,
+        struct.pack(f'{endian}HHHHH', min_byte2, max_byte2, min_byte1, max_byte1, default_char),
+        struct.pack(f'{endian}{len(table)}H', *table),
+    )
+
+
+def _dump_swidths_table(glyphs: list[BdfGlyph], table_format: int, endian: str) -> bytes:
+    return _pack_table(
+        table_format,
+        struct.pack(f'{endian}i', len(glyphs)),
+        struct.pack(f'{endian}{len(glyphs)}i', *[glyph.scalable_width_x for glyph in glyphs]),
+    )
+
+
+def _dump_glyph_names_table(glyphs: list[BdfGlyph], table_format: int, endian: str) -> bytes:
+    strings = bytearray()
+    offsets = [_pack_strings(strings, glyph.name) for glyph in glyphs]
+    return _pack_table(
+        table_format,
+        struct.pack(f'{endian}i', len(glyphs)),
+        struct.pack(f'{endian}{len(glyphs)}i', *offsets),
+        struct.pack(f'{endian}i', len(strings)),
+        strings,
+    )
+
+
+def _dump_pcf(font: 'BdfFont', glyph_pad: int, msb_first: bool) -> bytes:
+    if glyph_pad not in (1, 2, 4, 8):
+        raise ValueError(f'glyph pad must be 1, 2, 4 or 8: {glyph_pad}')
+    endian = '>' if msb_first else '<'
+    table_format = _PCF_DEFAULT_FORMAT | (glyph_pad.bit_length() - 1)
+    if msb_first:
+        table_format |= _PCF_BYTE_MASK | _PCF_BIT_MASK
+    glyphs = list(font.glyphs)
+    all_metrics = [_get_metrics(glyph) for glyph in glyphs]
+    accelerators = _dump_accelerators_table(font, all_metrics, table_format, endian)
+    tables = [
+        (_PCF_PROPERTIES, _dump_properties_table(font, table_format, endian)),
+        (_PCF_ACCELERATORS, accelerators),
+        (_PCF_METRICS, _dump_metrics_table(all_metrics, table_format, endian)),
+        (_PCF_BITMAPS, _dump_bitmaps_table(glyphs, table_format, endian, glyph_pad)),
+        (_PCF_BDF_ENCODINGS, _dump_encodings_table(font, glyphs, table_format, endian)),
+        (_PCF_SWIDTHS, _dump_swidths_table(glyphs, table_format, endian)),
+        (_PCF_GLYPH_NAMES, _dump_glyph_names_table(glyphs, table_format, endian)),
+        (_PCF_BDF_ACCELERATORS, accelerators),
+    ]
+    chunks = [_PCF_MAGIC, struct.pack('<i', len(tables))]
+    offset = 8 + len(tables) * 16
+    for table_type, data in tables:
+        (data_format,) = struct.unpack_from('<i', data)
+        chunks.append(struct.pack('<iiii', table_type, data_format, len(data), offset))
+        offset += len(data)
+    chunks.extend(data for _, data in tables)
+    return b''.join(chunks)
@@ -0,0 +1,53 @@
+import sys
+from collections.abc import Iterable
+
+from bdffont.glyph import BdfGlyph
+
+
+class BdfBitmapPool:
+    """
+    Makes glyphs with identical packed bitmaps share one bytes object, within a font or across fonts.
+    The bitmaps are immutable, so editing a glyph gives it a new bitmap and leaves the shared one untouched.
+    """
+
+    saved_bytes: int
+    _bitmaps: dict[bytes, bytes]
+
+    def __init__(self):
+        self.saved_bytes = 0
+        self._bitmaps = {}
+
+    def __len__(self) -> int:
+        return len(self._bitmaps)
+
+    def __contains__(self, bitmap_data: bytes) -> bool:
+        return bitmap_data in self._bitmaps
+
+    def intern(self, bitmap_data: bytes) -> bytes:
+        """
+        Returns the bitmap in the pool that is equal to the given one, adding it if there is none.
+        """
+        shared = self._bitmaps.setdefault(bitmap_data, bitmap_data)
+        if shared is not bitmap_data:
+            self.saved_bytes += sys.getsizeof(bitmap_data)
+        return shared
+
+    def intern_glyphs(self, glyphs: Iterable[BdfGlyph]):
+        """
+        Replaces the bitmap of each glyph with the one in the pool.
+        """
+        bitmaps = self._bitmaps
+        saved_bytes = 0
+        for glyph in glyphs:
+            bitmap_data = glyph.bitmap_data
+            shared = bitmaps.setdefault(bitmap_data, bitmap_data)
+            if shared is not bitmap_data:
+                saved_bytes += sys.getsizeof(bitmap_data)
+            glyph.bitmap_data = shared
+        self.saved_bytes += saved_bytes
+
+    def clear(self):
+        """
+        Forgets the bitmaps in the pool. Glyphs keep sharing the bitmaps they already have.
+        """
+        self._bitmaps.clear()
@@ -1,5 +1,7 @@
 import re
 from collections import UserDict
+from collections.abc import Mapping
+from itertools import repeat
 from typing import Any
 
 from bdffont.error import BdfXlfdError
@@ -87,7 +89,82 @@ _XLFD_KEYS_ORDER = [
 ]
 
 
+_XLFD_ILLEGAL_CHARACTERS_PATTERN = re.compile(r'[-?*,"]')
+
+# Matches the keys that are empty or only underscores, one key per line.
+_BLANK_KEY_PATTERN = re.compile(r'^_*$', re.MULTILINE)
+
+
+def _check_item(key: Any, value: Any) -> str:
+    """
+    Checks a property that is not None, and returns the key in upper case.
+    """
+    if not isinstance(key, str):
+        raise KeyError(f"expected type 'str', got '{type(key).__name__}' instead")
+    key = key.upper()
+
+    if not key.replace('_', '').isalnum():
+        raise KeyError('contains illegal characters')
+
+    if key in _STR_VALUE_KEYS:
+        if not isinstance(value, str):
+            raise ValueError(f"expected type 'str', got '{type(value).__name__}' instead")
+    elif key in _INT_VALUE_KEYS:
+        if not isinstance(value, int):
+            raise ValueError(f"expected type 'int', got '{type(value).__name__}' instead")
+    else:
+        if not isinstance(value, str) and not isinstance(value, int):
+            raise ValueError(f"expected type 'str | int', got '{type(value).__name__}' instead")
+
+    if key in _XLFD_STR_VALUE_KEYS:
+        matched = _XLFD_ILLEGAL_CHARACTERS_PATTERN.search(value)
+        if matched is not None:
+            raise ValueError(f'contains illegal characters {repr(matched.group())}')
+
+    return key
+
+
+def _check_items(data: Mapping[Any, Any]) -> dict[Any, Any]:
+    """
+    Checks many properties at once, and returns them with the keys in upper case. None values are kept.
+    Keys and values of plain 'str' and 'int' are checked with a few calls over all items. Anything else, or keys that
+    differ only in case, falls back to checking the items one by one, which raises the same errors as setting them
+    one by one.
+    """
+    keys = list(data)
+    values = list(data.values())
+    if all(map(isinstance, keys, repeat(str))) and set(map(type, values)) <= {str, int}:
+        lines = '\n'.join(keys)
+        if ''.join(keys).replace('_', '').isalnum() and _BLANK_KEY_PATTERN.search(lines) is None:
+            items = dict(zip(lines.upper().split('\n'), values))
+            if (len(items) == len(keys) and
+                    all(type(items[key]) is str for key in _STR_VALUE_KEYS.intersection(items)) and
+                    all(type(items[key]) is int for key in _INT_VALUE_KEYS.intersection(items)) and
+                    _XLFD_ILLEGAL_CHARACTERS_PATTERN.search(
+                        ''.join([items[key] for key in _XLFD_STR_VALUE_KEYS.intersection(items)]),
+                    ) is None):
+                return items
+
+    items = {}
+    for key, value in data.items():
+        if value is None:
+            items[key.upper() if isinstance(key, str) else key] = None
+        else:
+            items[_check_item(key, value)] = value
+    return items
+
+
 class BdfProperties(UserDict[str, str | int]):
+    @staticmethod
+    def from_trusted(data: Mapping[str, str | int], comments: list[str] | None = None) -> 'BdfProperties':
+        """
+        Creates properties without checking them, for data that is known to be valid, such as the properties of
+        another font. The keys must be in upper case. Call 'validate' to check them afterwards.
+        """
+        properties = BdfProperties(comments=comments)
+        properties.data.update(data)
+        return properties
+
     comments: list[str]
 
     def __init__(
@@ -113,30 +190,28 @@ class BdfProperties(UserDict[str, str | int]):
         if value is None:
             self.pop(key, None)
             return
+        super().__setitem__(_check_item(key, value), value)
 
-        if not isinstance(key, str):
-            raise KeyError(f"expected type 'str', got '{type(key).__name__}' instead")
-        key = key.upper()
-
-        if not key.replace('_', '').isalnum():
-            raise KeyError('contains illegal characters')
-
-        if key in _STR_VALUE_KEYS:
-            if not isinstance(value, str):
-                raise ValueError(f"expected type 'str', got '{type(value).__name__}' instead")
-        elif key in _INT_VALUE_KEYS:
-            if not isinstance(value, int):
-                raise ValueError(f"expected type 'int', got '{type(value).__name__}' instead")
-        else:
-            if not isinstance(value, str) and not isinstance(value, int):
-                raise ValueError(f"expected type 'str | int', got '{type(value).__name__}' instead")
-
-        if key in _XLFD_STR_VALUE_KEYS:
-            matched = re.search(r'[-?*,"]', value)
-            if matched is not None:
-                raise ValueError(f'contains illegal characters {repr(matched.group())}')
-
-        super().__setitem__(key, value)
+    def update_bulk(self, data: Mapping[str, str | int | None]):
+        """
+        Sets many properties at once, the same as setting them one by one, but checked in a single pass.
+        If any of them is invalid, none is set.
+        """
+        items = _check_items(data)
+        self.data.update(items)
+        if None in items.values():
+            for key, value in items.items():
+                if value is None:
+                    self.data.pop(key, None)
+
+    def validate(self):
+        """
+        Raises the error that setting each property one by one would raise. Useful after 'from_trusted'.
+        """
+        if None in self.data.values():
+            raise ValueError("expected type 'str | int', got 'NoneType' instead")
+        if list(_check_items(self.data)) != list(self.data):
+            raise KeyError('contains lower case characters')
 
     def __delitem__(self, key: Any):
         if isinstance(key, str):
@@ -342,6 +417,7 @@ class BdfProperties(UserDict[str, str | int]):
         if font_name.count('-') != 14:
             raise BdfXlfdError("must be 14 '-'")
         tokens = font_name.removeprefix('-').split('-')
+        data = {}
         for key, token in zip(_XLFD_KEYS_ORDER, tokens):
             if token == '':
                 value = None
@@ -350,4 +426,5 @@ class BdfProperties(UserDict[str, str | int]):
                     value = token
                 else:
                     value = int(token)
-            self[key] = value
+            data[key] = value
+        self.update_bulk(data)
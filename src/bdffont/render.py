@@ -0,0 +1,133 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from bdffont.glyph import BdfGlyph, _DIGITS_TO_BITS
+
+if TYPE_CHECKING:
+    from bdffont.font import BdfFont
+
+
+class _RenderedGlyph:
+    """
+    A glyph ready to be drawn: its advance, its place relative to the pen and the baseline, and its rows as
+    integers with the leftmost pixel in the highest bit.
+    """
+
+    __slots__ = ('glyph', 'advance', 'left', 'top', 'width', 'rows')
+
+    glyph: BdfGlyph
+    advance: int
+    left: int
+    top: int
+    width: int
+    rows: list[int]
+
+    def __init__(self, glyph: BdfGlyph):
+        self.glyph = glyph
+        self.advance = glyph.device_width_x
+        self.left = glyph.offset_x
+        self.top = glyph.offset_y + glyph.height
+        self.width = glyph.width
+        stride = glyph.bitmap_stride
+        if stride == 0:
+            self.rows = []
+        else:
+            bitmap_data = glyph.bitmap_data
+            shift = stride * 8 - glyph.width
+            self.rows = [
+                int.from_bytes(bitmap_data[start:start + stride], 'big') >> shift
+                for start in range(0, len(bitmap_data) - stride + 1, stride)
+            ][:glyph.height]
+
+
+class BdfTextRenderer:
+    """
+    Lays out and draws text with the glyphs of a font, keeping the most recently used glyphs decoded.
+    The cache notices glyphs that are added, removed or replaced in the font. After editing a glyph in place,
+    call 'clear_cache'.
+    """
+
+    font: 'BdfFont'
+    cache_size: int
+    _cache: OrderedDict[int, _RenderedGlyph | None]
+
+    def __init__(self, font: 'BdfFont', cache_size: int = 1024):
+        """
+        :param font:
+            The font to draw with.
+        :param cache_size:
+            The number of decoded glyphs to keep.
+        """
+        self.font = font
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+
+    def clear_cache(self):
+        self._cache.clear()
+
+    def _find_glyph(self, code_point: int) -> BdfGlyph | None:
+        glyph = self.font.get_glyph(code_point)
+        if glyph is None:
+            default_char = self.font.properties.default_char
+            if default_char is not None:
+                glyph = self.font.get_glyph(default_char)
+        return glyph
+
+    def _get_rendered_glyph(self, code_point: int) -> _RenderedGlyph | None:
+        cache = self._cache
+        glyph = self._find_glyph(code_point)
+        if code_point in cache:
+            rendered_glyph = cache[code_point]
+            if (None if rendered_glyph is None else rendered_glyph.glyph) is glyph:
+                cache.move_to_end(code_point)
+                return rendered_glyph
+        rendered_glyph = None if glyph is None else _RenderedGlyph(glyph)
+        cache[code_point] = rendered_glyph
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return rendered_glyph
+
+    def _layout(self, text: str) -> list[tuple[int, _RenderedGlyph]]:
+        layout = []
+        x = 0
+        for character in text:
+            rendered_glyph = self._get_rendered_glyph(ord(character))
+            if rendered_glyph is not None:
+                layout.append((x, rendered_glyph))
+                x += rendered_glyph.advance
+        return layout
+
+    def measure_text(self, text: str) -> tuple[int, int]:
+        """
+        The width and height of the drawn text. The width is the sum of the device widths, and the height is
+        the height of the font bounding box.
+        Characters without a glyph are drawn as the 'DEFAULT_CHAR' glyph, or skipped if the font has none.
+        """
+        width = 0
+        for character in text:
+            rendered_glyph = self._get_rendered_glyph(ord(character))
+            if rendered_glyph is not None:
+                width += rendered_glyph.advance
+        return width, self.font.height
+
+    def render_text(self, text: str) -> list[list[int]]:
+        """
+        Draws the text on one line into a bitmap of the size given by 'measure_text', with the baseline placed
+        by the offset of the font bounding box. Pixels outside the bitmap are clipped.
+        """
+        layout = self._layout(text)
+        width = sum(rendered_glyph.advance for _, rendered_glyph in layout)
+        height = self.font.height
+        if width <= 0:
+            return [[] for _ in range(height)]
+        baseline = height + self.font.offset_y
+        canvas = [0] * height
+        for x, rendered_glyph in layout:
+            shift = width - (x + rendered_glyph.left + rendered_glyph.width)
+            y = baseline - rendered_glyph.top
+            for row in rendered_glyph.rows:
+                if 0 <= y < height:
+                    canvas[y] |= row << shift if shift >= 0 else row >> -shift
+                y += 1
+        mask = (1 << width) - 1
+        return [list(format(row & mask, f'0{width}b').encode().translate(_DIGITS_TO_BITS)) for row in canvas]
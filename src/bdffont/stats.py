@@ -0,0 +1,43 @@
+class BdfStats:
+    """
+    Collects the seconds spent in each phase of parsing and dumping, and counts of what went through them.
+    The values add up over calls, so one object can follow a batch of fonts.
+
+    Phases of parsing, in 'seconds':
+        'parse': The whole parse.
+        'parse.other': The header lines, and the rest that is not in the phases below.
+        'parse.properties': The properties segment.
+        'parse.glyphs': The glyph segments, without their bitmaps. Only the scan of each glyph when lazy.
+        'parse.bitmaps': The bitmap rows of the glyphs.
+        'load.read': Reading or mapping the file, when loading.
+
+    Phases of dumping, in 'seconds':
+        'dump': The whole dump.
+        'dump.header': Formatting the header and the properties.
+        'dump.glyphs': Formatting the glyphs, or copying the blocks of unchanged lazy glyphs.
+        'dump.write': Writing to the stream or file.
+
+    Counts, in 'counts', with the same 'parse.' and 'dump.' prefixes:
+        'lines': The lines of the file.
+        'bytes': The bytes of the file, or the characters when parsing or dumping text.
+        'glyphs': The glyphs.
+        'bitmap_rows': The bitmap rows of the glyphs, leaving out lazy glyphs that are not loaded.
+    And 'load.cache_hits', the loads served from the cache.
+    """
+
+    seconds: dict[str, float]
+    counts: dict[str, int]
+
+    def __init__(self):
+        self.seconds = {}
+        self.counts = {}
+
+    def add_seconds(self, phase: str, seconds: float):
+        self.seconds[phase] = self.seconds.get(phase, 0.0) + seconds
+
+    def add_count(self, key: str, count: int):
+        self.counts[key] = self.counts.get(key, 0) + count
+
+    def clear(self):
+        self.seconds.clear()
+        self.counts.clear()
@@ -0,0 +1,367 @@
+import mmap
+import re
+from collections.abc import Callable, Iterable, Iterator
+from io import StringIO, TextIOBase
+from os import PathLike
+from typing import Any, BinaryIO, TextIO
+
+from bdffont.cache import _replace_file
+from bdffont.error import BdfDumpError, BdfMissingWordError, BdfIllegalWordError, BdfCountError
+from bdffont.font import (
+    BdfFont,
+    _Lines,
+    _BufferLines,
+    _create_lines_iterator,
+    _create_bytes_lines_iterator,
+    _iter_font,
+    _scan_glyph_segment,
+    _stop_at_glyph_segment,
+    _convert_tail_to_str,
+    _map_file,
+    _close_buffer,
+    _dump_header,
+    _format_glyph,
+    _format_word_str_line,
+    _format_word_ints_line,
+    _WORD_CHARS,
+    _WORD_STARTCHAR,
+    _WORD_COMMENT,
+    _WORD_ENDFONT,
+)
+from bdffont.glyph import BdfGlyph
+
+# Wide enough for any count of glyphs that fits in a file.
+_CHARS_PLACEHOLDER_WIDTH = 10
+
+# The most bytes of glyph blocks copied in one write when subsetting.
+_SUBSET_CHUNK_SIZE = 1 << 20
+
+# The head of a glyph block, up to an 'ENCODING' line that holds a single integer.
+_GLYPH_HEAD_PATTERN = re.compile(rb'STARTCHAR [^\n]*\n(?:COMMENT[^\n]*\n)*ENCODING +(-?\d+) *\r?\n')
+
+
+class BdfGlyphIterator(Iterator[BdfGlyph]):
+    """
+    Parses the glyphs of a font one by one, without keeping them.
+    The header of the font is parsed on creation, so 'header' is ready before the first glyph.
+    """
+
+    header: BdfFont
+
+    def __init__(self, source: str | PathLike[str] | TextIO | BinaryIO):
+        """
+        :param source:
+            The path of the font file, or a text or binary stream of it. A file opened from a path is memory-mapped
+            and closed at the end of the iteration or by 'close'.
+        """
+        self._buffer = None
+        if isinstance(source, (str, PathLike)):
+            with open(source, 'rb') as file:
+                self._buffer = _map_file(file)
+            lines: _Lines = _BufferLines(self._buffer)
+        elif isinstance(source, TextIOBase):
+            lines = _create_lines_iterator(source)
+        else:
+            lines = _create_bytes_lines_iterator(source)
+        self.header = BdfFont()
+        self._glyphs = _iter_font(lines, self.header, check_header=True)
+        try:
+            self._next_glyph = next(self._glyphs, None)
+        except BaseException:
+            self.close()
+            raise
+
+    def __iter__(self) -> 'BdfGlyphIterator':
+        return self
+
+    def __next__(self) -> BdfGlyph:
+        glyph = self._next_glyph
+        if glyph is None:
+            self.close()
+            raise StopIteration
+        try:
+            self._next_glyph = next(self._glyphs, None)
+        except BaseException:
+            self.close()
+            raise
+        return glyph
+
+    def __enter__(self) -> 'BdfGlyphIterator':
+        return self
+
+    def __exit__(self, *args: Any):
+        self.close()
+
+    def close(self):
+        self._next_glyph = None
+        self._glyphs.close()
+        if self._buffer is not None:
+            _close_buffer(self._buffer)
+            self._buffer = None
+
+
+def iter_glyphs(source: str | PathLike[str] | TextIO | BinaryIO) -> BdfGlyphIterator:
+    return BdfGlyphIterator(source)
+
+
+def load_header(source: str | PathLike[str] | TextIO | BinaryIO) -> BdfFont:
+    """
+    Parses the font up to its first glyph. The returned font has no glyphs.
+    """
+    with BdfGlyphIterator(source) as glyphs:
+        return glyphs.header
+
+
+class BdfWriter:
+    """
+    Writes a font glyph by glyph, so that the glyphs never need to be in memory at once.
+
+    The 'CHARS' line comes before the glyphs. If the count is not given up front, a fixed-width placeholder is
+    written, and it is overwritten with the actual count on 'close', which needs a seekable stream.
+    Files and binary streams are written as UTF-8 with LF line endings on every platform, like 'BdfFont.save'.
+    """
+
+    def __init__(
+            self,
+            target: str | PathLike[str] | TextIO | BinaryIO,
+            header: BdfFont,
+            glyphs_count: int | None = None,
+    ):
+        """
+        :param target:
+            The path of the font file, or a text or binary stream to write into.
+        :param header:
+            The font whose header and properties are written. Its glyphs are ignored.
+        :param glyphs_count:
+            The number of glyphs that will be written, if known.
+        """
+        if isinstance(target, (str, PathLike)):
+            self._stream = open(target, 'wb')
+            self._owns_stream = True
+        else:
+            self._stream = target
+            self._owns_stream = False
+        self._binary = not isinstance(self._stream, TextIOBase)
+        self._expected_glyphs_count = glyphs_count
+        self.glyphs_count = 0
+        try:
+            if glyphs_count is None and not self._stream.seekable():
+                raise BdfDumpError('the count of glyphs must be given for a non-seekable stream')
+            header_stream = StringIO()
+            _dump_header(header_stream, header)
+            self._write(header_stream.getvalue())
+            if glyphs_count is None:
+                self._chars_position = self._stream.tell()
+                self._dump_chars_line()
+            else:
+                self._chars_position = None
+                self._write(_format_word_ints_line(_WORD_CHARS, glyphs_count))
+        except BaseException:
+            self._release()
+            raise
+
+    def _write(self, text: str):
+        if self._binary:
+            self._stream.write(text.encode('utf-8'))
+        else:
+            self._stream.write(text)
+
+    def _dump_chars_line(self):
+        self._write(f'{_WORD_CHARS} {self.glyphs_count:<{_CHARS_PLACEHOLDER_WIDTH}}\n')
+
+    def write_glyph(self, glyph: BdfGlyph):
+        self._write(_format_glyph(glyph))
+        self.glyphs_count += 1
+
+    def write_glyphs(self, glyphs: Iterable[BdfGlyph]):
+        for glyph in glyphs:
+            self.write_glyph(glyph)
+
+    def close(self):
+        """
+        Writes 'ENDFONT' and fills in the count of glyphs.
+        """
+        if self._stream is None:
+            return
+        try:
+            if self._chars_position is None:
+                if self.glyphs_count != self._expected_glyphs_count:
+                    raise BdfDumpError(f'expected {self._expected_glyphs_count} glyphs, written {self.glyphs_count}')
+                self._write(_format_word_str_line(_WORD_ENDFONT))
+            else:
+                self._write(_format_word_str_line(_WORD_ENDFONT))
+                end_position = self._stream.tell()
+                self._stream.seek(self._chars_position)
+                self._dump_chars_line()
+                self._stream.seek(end_position)
+        finally:
+            self._release()
+
+    def _release(self):
+        if self._owns_stream:
+            self._stream.close()
+        self._stream = None
+
+    def __enter__(self) -> 'BdfWriter':
+        return self
+
+    def __exit__(self, exc_type: Any, *args: Any):
+        if exc_type is None:
+            self.close()
+        elif self._stream is not None:
+            self._release()
+
+
+def _create_encodings_filter(encodings: Iterable[int | range]) -> Callable[[int], bool]:
+    if isinstance(encodings, range):
+        return encodings.__contains__
+    codes = set()
+    ranges = []
+    for item in encodings:
+        if isinstance(item, range):
+            ranges.append(item)
+        else:
+            codes.add(item)
+    if len(ranges) == 0:
+        return codes.__contains__
+    return lambda encoding: encoding in codes or any(encoding in values for values in ranges)
+
+
+def _copy_subset_header(buffer: bytes | mmap.mmap, end: int, stream: BinaryIO) -> tuple[int, int, bytes]:
+    """
+    Copies the header, which ends where the first glyph or 'ENDFONT' starts, with a placeholder for the count of
+    'CHARS'. Returns the count of 'CHARS', the position of its line in the stream and its line ending.
+    """
+    header = buffer[:end]
+    lines = _BufferLines(header)
+    chars_start = 0
+    chars_end = 0
+    font_glyphs_count = 0
+    for word, tail in lines:
+        if word == _WORD_CHARS:
+            font_glyphs_count = int(tail)
+            chars_start = header.rfind(b'\n', 0, lines.position - 1) + 1
+            chars_end = lines.position
+    line_ending = b'\r\n' if header[chars_start:chars_end].endswith(b'\r\n') else b'\n'
+    stream.write(header[:chars_start])
+    chars_position = stream.tell()
+    _write_subset_chars_line(stream, 0, line_ending)
+    stream.write(header[chars_end:])
+    return font_glyphs_count, chars_position, line_ending
+
+
+def _write_subset_chars_line(stream: BinaryIO, glyphs_count: int, line_ending: bytes):
+    stream.write(f'{_WORD_CHARS} {glyphs_count:<{_CHARS_PLACEHOLDER_WIDTH}}'.encode() + line_ending)
+
+
+def _iter_glyph_blocks(buffer: bytes | mmap.mmap, position: int) -> Iterator[tuple[int, int, int]]:
+    """
+    Yields the encoding, start and end of each glyph block from the position up to 'ENDFONT', and then the start
+    and end of the 'ENDFONT' line with an encoding of 'None'.
+    The head of a well-formed block is matched by a pattern and its 'ENDCHAR' line is searched for. Anything
+    else is read line by line, and the glyphs through the lazy scan, which also raises the errors.
+    """
+    match = _GLYPH_HEAD_PATTERN.match
+    find = buffer.find
+    while True:
+        head = match(buffer, position)
+        if head is not None:
+            endchar_index = find(b'\nENDCHAR', head.end() - 1)
+            if endchar_index != -1:
+                end = find(b'\n', endchar_index + 1) + 1
+                if end == 0:
+                    end = len(buffer)
+                if buffer[endchar_index:end].strip() == b'ENDCHAR':
+                    yield int(head.group(1)), position, end
+                    position = end
+                    continue
+        lines = _BufferLines(buffer, position)
+        for word, tail in lines:
+            if word == _WORD_STARTCHAR:
+                glyph = _scan_glyph_segment(lines, _convert_tail_to_str(tail))
+                yield glyph.encoding, glyph._start, glyph._end
+                position = glyph._end
+                break
+            elif word == _WORD_COMMENT:
+                position = lines.position
+                break
+            elif word == _WORD_ENDFONT:
+                start = buffer.rfind(b'\n', 0, lines.position - 1) + 1
+                yield None, start, min(lines.position, len(buffer))
+                return
+            else:
+                raise BdfIllegalWordError(_convert_tail_to_str(word))
+        else:
+            raise BdfMissingWordError(_WORD_ENDFONT)
+
+
+def _subset_to_stream(
+        source: str | PathLike[str],
+        stream: BinaryIO,
+        contains: Callable[[int], bool],
+) -> int:
+    with open(source, 'rb') as file:
+        buffer = _map_file(file)
+    try:
+        lines = _BufferLines(buffer)
+        for _ in _iter_font(lines, BdfFont(), _stop_at_glyph_segment, True):
+            break
+        header_end = buffer.rfind(b'\n', 0, lines.position - 1) + 1
+        font_glyphs_count, chars_position, line_ending = _copy_subset_header(buffer, header_end, stream)
+        run_start = 0
+        run_end = 0
+        all_glyphs_count = 0
+        glyphs_count = 0
+        for encoding, start, end in _iter_glyph_blocks(buffer, header_end):
+            if encoding is None:
+                stream.write(buffer[run_start:run_end])
+                stream.write(buffer[start:end])
+                break
+            all_glyphs_count += 1
+            if contains(encoding):
+                glyphs_count += 1
+                if start != run_end or run_end - run_start >= _SUBSET_CHUNK_SIZE:
+                    stream.write(buffer[run_start:run_end])
+                    run_start = start
+                run_end = end
+        if all_glyphs_count != font_glyphs_count:
+            raise BdfCountError(_WORD_CHARS, font_glyphs_count, all_glyphs_count)
+    finally:
+        _close_buffer(buffer)
+    end_position = stream.tell()
+    stream.seek(chars_position)
+    _write_subset_chars_line(stream, glyphs_count, line_ending)
+    stream.seek(end_position)
+    return glyphs_count
+
+
+def subset(
+        source: str | PathLike[str],
+        target: str | PathLike[str] | BinaryIO,
+        encodings: Iterable[int | range],
+) -> int:
+    """
+    Copies the glyphs with the given encodings from one font file into another, without parsing them.
+    Only the 'ENCODING' line of each glyph is read. The blocks of the matching glyphs and the header are copied as
+    they are, except for the count of 'CHARS', which is written as a fixed-width placeholder and filled in at the
+    end. The source is memory-mapped and goes through one glyph at a time, so the memory use stays the same for any
+    size of font. Comments between the glyphs are left out, and as with a lazy load, errors inside the glyphs are
+    not detected.
+    Returns the number of glyphs copied.
+
+    :param source:
+        The path of the font file.
+    :param target:
+        The path of the font file to write, or a seekable binary stream. A path is written through a temporary file
+        that then replaces it, so the source and the target can be the same file.
+    :param encodings:
+        The encodings to keep, as a set, a range, or any mix of encodings and ranges.
+    """
+    contains = _create_encodings_filter(encodings)
+    if not isinstance(target, (str, PathLike)):
+        if not target.seekable():
+            raise BdfDumpError('subsetting needs a seekable stream')
+        return _subset_to_stream(source, target, contains)
+
+    with _replace_file(target) as file:
+        return _subset_to_stream(source, file, contains)
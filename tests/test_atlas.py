@@ -0,0 +1,41 @@
+from pathlib import Path
+
+import pytest
+
+from bdffont import BdfFont, BdfGlyph
+
+
+def test_atlas(assets_dir: Path):
+    font = BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic.bdf'))
+    atlas = font.build_atlas(max_width=256, padding=1)
+    assert atlas.width == 256
+    assert len(atlas.pixels) == atlas.width * atlas.height
+    assert len(atlas.glyphs) == len({glyph.encoding for glyph in font.glyphs})
+
+    for glyph in font.glyphs:
+        atlas_glyph = atlas.glyphs[glyph.encoding]
+        assert (atlas_glyph.width, atlas_glyph.height, atlas_glyph.offset_x, atlas_glyph.offset_y) == glyph.bounding_box
+        assert (atlas_glyph.device_width_x, atlas_glyph.device_width_y) == glyph.device_width
+        assert atlas_glyph.uv[0] == atlas_glyph.x / atlas.width
+        assert atlas_glyph.uv[3] == (atlas_glyph.y + atlas_glyph.height) / atlas.height
+        for y, bitmap_row in enumerate(glyph.bitmap):
+            for x, pixel in enumerate(bitmap_row):
+                assert atlas.get_pixel(atlas_glyph.x + x, atlas_glyph.y + y) == (255 if pixel else 0)
+
+
+def test_atlas_dedup():
+    font = BdfFont()
+    for encoding in range(3):
+        font.glyphs.append(BdfGlyph(
+            name=f'g{encoding}',
+            encoding=encoding,
+            bounding_box=(2, 2, 0, 0),
+            bitmap=[[1, 0], [0, 1]] if encoding < 2 else [[1, 1], [1, 1]],
+        ))
+    atlas = font.build_atlas(max_width=8, padding=1)
+    assert (atlas.glyphs[0].x, atlas.glyphs[0].y) == (atlas.glyphs[1].x, atlas.glyphs[1].y)
+    assert (atlas.glyphs[0].x, atlas.glyphs[0].y) != (atlas.glyphs[2].x, atlas.glyphs[2].y)
+    assert (atlas.width, atlas.height) == (8, 4)
+
+    with pytest.raises(ValueError):
+        font.build_atlas(max_width=3, padding=1)
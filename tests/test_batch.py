@@ -0,0 +1,21 @@
+from pathlib import Path
+
+from bdffont import BdfFont, load_many
+from bdffont.error import BdfCountError
+
+
+def test_load_many(assets_dir: Path):
+    file_paths = [
+        assets_dir.joinpath('misaki', 'misaki_gothic.bdf'),
+        assets_dir.joinpath('misaki', 'misaki_gothic_2nd.bdf'),
+        assets_dir.joinpath('misaki', 'misaki_mincho.bdf'),
+        assets_dir.joinpath('demo.bdf'),
+        assets_dir.joinpath('damaged', 'incorrect_chars_count.bdf'),
+    ]
+    results = dict(load_many(file_paths, workers=2))
+    assert list(sorted(results)) == list(sorted(file_paths))
+    for file_path in file_paths[:-1]:
+        assert results[file_path] == BdfFont.load(file_path)
+    error = results[file_paths[-1]]
+    assert isinstance(error, BdfCountError)
+    assert str(error) == "the count of 'CHARS' is incorrect: 1000 -> 2"
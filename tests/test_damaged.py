@@ -121,3 +121,12 @@ def test_incorrect_chars_count(assets_dir: Path):
         BdfFont.load(assets_dir.joinpath('damaged', 'incorrect_chars_count.bdf'))
     assert info.value.word == 'CHARS'
     assert str(info.value) == "the count of 'CHARS' is incorrect: 1000 -> 2"
+
+
+def test_workers(assets_dir: Path):
+    for file_path in assets_dir.joinpath('damaged').iterdir():
+        with pytest.raises(Exception) as info:
+            BdfFont.load(file_path)
+        with pytest.raises(type(info.value)) as workers_info:
+            BdfFont.load(file_path, workers=2)
+        assert str(workers_info.value) == str(info.value)
@@ -1,8 +1,10 @@
+import weakref
 from pathlib import Path
 
 import pytest
 
-from bdffont import BdfFont
+from bdffont import BdfFont, BdfGlyph
+from bdffont.glyph import BdfGlyphList
 from bdffont.error import BdfXlfdError
 
 
@@ -96,3 +98,155 @@ def test_eq(assets_dir: Path):
     font_1 = BdfFont.load(file_path)
     font_2 = BdfFont.load(file_path)
     assert font_1 == font_2
+
+
+def test_weakref(assets_dir: Path):
+    font = BdfFont.load(assets_dir.joinpath('demo.bdf'), lazy=True)
+    font_ref = weakref.ref(font)
+    glyph_refs = [weakref.ref(font.glyphs[0]), weakref.ref(BdfGlyph(name='A', encoding=65))]
+    assert font_ref() is font
+    assert glyph_refs[0]() is font.glyphs[0]
+    assert glyph_refs[0]().bitmap == font.glyphs[0].bitmap
+    del font
+    assert font_ref() is None
+    assert all(glyph_ref() is None for glyph_ref in glyph_refs)
+
+
+def test_get_glyph():
+    font = BdfFont()
+    font.glyphs.extend(BdfGlyph(name=f'uni{encoding:04X}', encoding=encoding) for encoding in range(0x20, 0x80))
+    assert font.get_glyph(0x41).name == 'uni0041'
+    assert font.get_glyph_by_name('uni0042').encoding == 0x42
+    assert font.get_glyph(0x80) is None
+    assert font.get_glyph_by_name('A') is None
+
+    glyph = BdfGlyph(name='A', encoding=0x80)
+    font.glyphs.append(glyph)
+    assert font.get_glyph(0x80) is glyph
+    assert font.get_glyph_by_name('A') is glyph
+
+    font.glyphs.remove(glyph)
+    assert font.get_glyph(0x80) is None
+
+    font.glyphs[0x41 - 0x20] = glyph
+    assert font.get_glyph(0x41) is None
+    assert font.get_glyph(0x80) is glyph
+
+    glyph.encoding = 0x41
+    assert font.get_glyph(0x80) is None
+    assert font.get_glyph(0x41) is glyph
+
+    font.glyphs.insert(0, BdfGlyph(name='B', encoding=0x41))
+    assert font.get_glyph(0x41).name == 'B'
+    font.glyphs.reverse()
+    assert font.get_glyph(0x41) is glyph
+
+    assert [glyph.encoding for glyph in font.get_glyphs_in_range(0x30, 0x3A)] == list(range(0x30, 0x3A))
+    assert font.glyphs.sorted_encodings == list(range(0x20, 0x80))
+
+    font.glyphs = []
+    assert font.get_glyph(0x41) is None
+    assert font.get_glyphs_in_range(0, 0x110000) == []
+
+
+def test_set_glyphs():
+    glyphs = [BdfGlyph(name='A', encoding=0x41)]
+    font = BdfFont(glyphs=glyphs)
+    assert font.glyphs is not glyphs
+    assert font.glyphs == glyphs
+    glyphs.append(BdfGlyph(name='B', encoding=0x42))
+    assert len(font.glyphs) == 1
+    assert font.get_glyph(0x42) is None
+
+    font.glyphs = glyphs
+    assert font.glyphs is not glyphs
+    assert font.get_glyph(0x42) is glyphs[1]
+
+    glyphs = BdfGlyphList(glyphs)
+    font.glyphs = glyphs
+    assert font.glyphs is glyphs
+    glyphs.append(BdfGlyph(name='C', encoding=0x43))
+    assert font.get_glyph(0x43) is glyphs[2]
+
+
+def test_recompute_metrics(assets_dir: Path):
+    font = BdfFont()
+    font.glyphs.append(BdfGlyph(name='A', encoding=0x41, device_width=(8, 0), bounding_box=(6, 10, 1, -2)))
+    font.glyphs.append(BdfGlyph(name='B', encoding=0x42, device_width=(8, 0), bounding_box=(7, 12, 0, 0)))
+    font.glyphs.append(BdfGlyph(name='space', encoding=0x20, device_width=(8, 0), bounding_box=(0, 0, -5, -5)))
+    font.recompute_metrics()
+    assert font.bounding_box == (7, 14, 0, -2)
+    assert font.properties.average_width == 80
+    assert font.properties.font_ascent == 12
+    assert font.properties.font_descent == 2
+    assert font.properties.spacing == 'C'
+
+    font.recompute_metrics(incremental=True)
+    glyph = BdfGlyph(name='W', encoding=0x57, device_width=(8, 0), bounding_box=(10, 8, -1, 0))
+    font.glyphs.append(glyph)
+    font.recompute_metrics(incremental=True)
+    assert font.bounding_box == (10, 14, -1, -2)
+    assert font.properties.spacing == 'M'
+
+    font.glyphs[0] = BdfGlyph(name='A', encoding=0x41, device_width=(12, 0), bounding_box=(6, 10, 1, -3))
+    font.recompute_metrics(incremental=True)
+    assert font.bounding_box == (10, 15, -1, -3)
+    assert font.properties.average_width == 90
+    assert font.properties.font_descent == 3
+    assert font.properties.spacing == 'P'
+
+    font.glyphs.remove(glyph)
+    del font.glyphs[0]
+    font.recompute_metrics(incremental=True)
+    assert font.bounding_box == (7, 12, 0, 0)
+    assert font.properties.spacing == 'C'
+
+    font = BdfFont.load(assets_dir.joinpath('demo.bdf'))
+    bounding_box = font.bounding_box
+    font.recompute_metrics(incremental=True)
+    assert font.bounding_box == bounding_box
+    font.glyphs.extend(font.glyphs[:10])
+    font.glyphs.pop()
+    font.glyphs[1:3] = []
+    font.recompute_metrics(incremental=True)
+    incremental = font.bounding_box, font.properties.copy()
+    font.recompute_metrics()
+    assert (font.bounding_box, font.properties) == incremental
+
+
+def test_crop_glyphs(assets_dir: Path):
+    font = BdfFont.load(assets_dir.joinpath('demo.bdf'))
+    text = ''.join(chr(glyph.encoding) for glyph in font.glyphs if glyph.encoding >= 0)
+    pixels = font.render_text(text)
+    font.crop_glyphs()
+    assert font.render_text(text) == pixels
+    bounding_boxes = [glyph.bounding_box for glyph in font.glyphs]
+    font.crop_glyphs()
+    assert [glyph.bounding_box for glyph in font.glyphs] == bounding_boxes
+
+    font.pad_glyphs_to_font_bbox()
+    assert font.render_text(text) == pixels
+    assert all(glyph.bounding_box == font.bounding_box for glyph in font.glyphs)
+
+
+def test_bitmaps_as_array(assets_dir: Path):
+    pytest.importorskip('numpy')
+
+    font = BdfFont.load(assets_dir.joinpath('demo.bdf'))
+    bitmaps, bounding_boxes = font.bitmaps_as_array()
+    height = max(glyph.height for glyph in font.glyphs)
+    width = max(glyph.width for glyph in font.glyphs)
+    assert bitmaps.shape == (len(font.glyphs), height, width)
+    assert bounding_boxes.tolist() == [list(glyph.bounding_box) for glyph in font.glyphs]
+    for cell, glyph in zip(bitmaps, font.glyphs):
+        assert cell[:glyph.height, :glyph.width].tolist() == glyph.bitmap
+        assert cell.sum() == sum(map(sum, glyph.bitmap))
+
+    inverted = BdfFont.load(assets_dir.joinpath('demo.bdf'))
+    inverted.set_bitmaps_from_array(1 - bitmaps)
+    for inverted_glyph, glyph in zip(inverted.glyphs, font.glyphs):
+        assert inverted_glyph.bitmap == [[1 - pixel for pixel in row] for row in glyph.bitmap]
+
+    packed_bitmaps, _ = font.bitmaps_as_array(packed=True)
+    inverted.set_bitmaps_from_array(packed_bitmaps, packed=True)
+    assert inverted == font
@@ -1,3 +1,5 @@
+import pytest
+
 from bdffont import BdfGlyph
 
 
@@ -37,3 +39,118 @@ def test_glyph():
     assert glyph.height == 10
     assert glyph.offset_x == 11
     assert glyph.offset_y == 12
+
+
+def test_bitmap_data():
+    glyph = BdfGlyph(
+        name='A',
+        encoding=65,
+        bounding_box=(10, 2, 0, 0),
+        bitmap_data=b'\x81\xc0\x7f\x40',
+    )
+    assert glyph.bitmap_stride == 2
+    assert glyph.bitmap_data == b'\x81\xc0\x7f\x40'
+    assert glyph.bitmap == [
+        [1, 0, 0, 0, 0, 0, 0, 1, 1, 1],
+        [0, 1, 1, 1, 1, 1, 1, 1, 0, 1],
+    ]
+
+    glyph.bitmap[0][1] = 1
+    assert glyph.bitmap_data == b'\xc1\xc0\x7f\x40'
+
+    glyph.bitmap = [
+        [1, 1, 1],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1],
+    ]
+    assert glyph.bitmap_data == b'\xe0\x00\x00\x7f'
+
+    glyph.bitmap_data = b'\xff\xc0'
+    assert glyph.bitmap == [[1, 1, 1, 1, 1, 1, 1, 1, 1, 1]]
+
+
+def test_bitmap_eq():
+    glyph_1 = BdfGlyph(name='A', encoding=65, bounding_box=(3, 2, 0, 0), bitmap=[[1, 0, 1], [0, 1, 0]])
+    glyph_2 = BdfGlyph(name='A', encoding=65, bounding_box=(3, 2, 0, 0), bitmap_data=b'\xa0\x40')
+    glyph_3 = BdfGlyph(name='A', encoding=65, bounding_box=(3, 2, 0, 0), bitmap_data=b'\xa0\x40')
+    assert glyph_1 == glyph_2
+    assert glyph_2 == glyph_3
+    assert glyph_2.bitmap_data == b'\xa0\x40'
+
+    glyph_4 = BdfGlyph(name='A', encoding=65, bounding_box=(4, 1, 0, 0), bitmap_data=b'\xff')
+    glyph_5 = BdfGlyph(name='A', encoding=65, bounding_box=(4, 1, 0, 0), bitmap_data=b'\xf0')
+    assert glyph_4.bitmap_data == b'\xf0'
+    assert glyph_4 == glyph_5
+    glyph_5.bitmap_data = b'\xfe'
+    assert glyph_5.bitmap_data == b'\xf0'
+    assert glyph_4 == glyph_5
+
+
+def test_comments():
+    glyph_1 = BdfGlyph(name='A', encoding=65)
+    glyph_2 = BdfGlyph(name='A', encoding=65, comments=[])
+    assert not hasattr(glyph_1, '__dict__')
+    assert glyph_1 == glyph_2
+
+    glyph_1.comments.append('a')
+    assert glyph_1.comments == ['a']
+    assert glyph_1 != glyph_2
+
+    glyph_2.comments = ['a']
+    assert glyph_1 == glyph_2
+
+
+def test_crop_pad():
+    bitmap = [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
+        [0, 0, 1, 1, 0, 0, 0, 0, 1, 0],
+        [0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+    ]
+    glyph = BdfGlyph(name='A', encoding=65, bounding_box=(10, 4, -1, -2), bitmap=bitmap)
+    glyph.crop()
+    assert glyph.bounding_box == (7, 2, 1, -1)
+    assert glyph.bitmap == [
+        [1, 0, 0, 0, 0, 0, 0],
+        [1, 1, 0, 0, 0, 0, 1],
+    ]
+    assert glyph.bitmap_data == b'\x80\xc2'
+
+    glyph.pad((10, 4, -1, -2))
+    assert glyph.bounding_box == (10, 4, -1, -2)
+    assert glyph.bitmap == bitmap
+
+    with pytest.raises(ValueError) as info:
+        glyph.pad((10, 4, 0, -2))
+    assert info.value.args[0] == "glyph 'A' is outside the bounding box: (10, 4, 0, -2)"
+
+    glyph = BdfGlyph(name='space', encoding=32, bounding_box=(8, 4, 0, -2), bitmap_data=bytes(4))
+    glyph.crop()
+    assert glyph.bounding_box == (0, 0, 0, 0)
+    assert glyph.bitmap_data == b''
+    glyph.pad((9, 2, -1, -1))
+    assert glyph.bitmap_data == bytes(4)
+
+
+def test_numpy():
+    np = pytest.importorskip('numpy')
+
+    glyph = BdfGlyph(
+        name='A',
+        encoding=65,
+        bounding_box=(10, 3, 0, 0),
+        bitmap=[
+            [1, 0, 0, 0, 0, 0, 0, 0, 0, 1],
+            [0, 1, 1, 1, 1, 1, 1, 1, 1, 0],
+            [1, 1, 0, 0, 0, 0, 0, 0, 1, 1],
+        ],
+    )
+    array = glyph.to_numpy()
+    assert array.dtype == np.uint8
+    assert array.tolist() == glyph.bitmap
+    packed = glyph.to_numpy(packed=True)
+    assert packed.shape == (3, 2)
+    assert packed.tobytes() == glyph.bitmap_data
+
+    assert BdfGlyph.from_numpy(array, 'A', 65) == glyph
+    assert BdfGlyph.from_numpy(array.astype(bool), 'A', 65) == glyph
+    assert BdfGlyph.from_numpy(np.zeros((0, 0)), 'A', 65) == BdfGlyph('A', 65)
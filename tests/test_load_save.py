@@ -1,6 +1,11 @@
+import copy
+import mmap
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from bdffont import BdfFont
+from bdffont import BdfFont, BdfGlyph
 
 
 def test_unifont(assets_dir: Path, tmp_path: Path):
@@ -33,3 +38,129 @@ def test_misaki_mincho(assets_dir: Path, tmp_path: Path):
     font = BdfFont.load(load_path)
     font.save(save_path)
     assert load_path.read_bytes() == save_path.read_bytes()
+
+
+def test_misaki_gothic_mmap(assets_dir: Path, tmp_path: Path):
+    load_path = assets_dir.joinpath('misaki', 'misaki_gothic.bdf')
+    save_path = tmp_path.joinpath('misaki_gothic.bdf')
+    font = BdfFont.load(load_path, mmap=True)
+    assert font == BdfFont.parse(load_path.read_text('utf-8'))
+    font.save(save_path)
+    assert load_path.read_bytes() == save_path.read_bytes()
+
+
+def test_misaki_gothic_lazy(assets_dir: Path, tmp_path: Path):
+    load_path = assets_dir.joinpath('misaki', 'misaki_gothic.bdf')
+    save_path = tmp_path.joinpath('misaki_gothic.bdf')
+    font = BdfFont.load(load_path, mmap=True, lazy=True)
+    glyph = {glyph.encoding: glyph for glyph in font.glyphs}[0x3042]
+    assert glyph.name == 'uni3042'
+    assert glyph.bounding_box == (7, 7, 0, -1)
+    assert font == BdfFont.load(load_path)
+    font.save(save_path)
+    assert load_path.read_bytes() == save_path.read_bytes()
+
+
+def test_misaki_gothic_workers(assets_dir: Path, tmp_path: Path):
+    load_path = assets_dir.joinpath('misaki', 'misaki_gothic.bdf')
+    save_path = tmp_path.joinpath('misaki_gothic.bdf')
+    font = BdfFont.load(load_path, workers=3)
+    assert font == BdfFont.load(load_path)
+    font.save(save_path)
+    assert load_path.read_bytes() == save_path.read_bytes()
+
+
+def test_cache(assets_dir: Path, tmp_path: Path):
+    load_path = tmp_path.joinpath('font.bdf')
+    cache_dir = tmp_path.joinpath('cache')
+    load_path.write_bytes(assets_dir.joinpath('misaki', 'misaki_gothic.bdf').read_bytes())
+    font = BdfFont.load(load_path)
+    assert BdfFont.load(load_path, cache_dir=cache_dir) == font
+    cache_paths = list(cache_dir.iterdir())
+    assert len(cache_paths) == 1
+    assert BdfFont.load(load_path, cache_dir=cache_dir) == font
+
+    cache_paths[0].write_bytes(cache_paths[0].read_bytes()[:-100])
+    assert BdfFont.load(load_path, cache_dir=cache_dir) == font
+    assert BdfFont.load(load_path, cache_dir=cache_dir, cache_hash=True) == font
+
+    load_path.write_bytes(assets_dir.joinpath('demo.bdf').read_bytes())
+    assert BdfFont.load(load_path, cache_dir=cache_dir, cache_hash=True) == BdfFont.load(load_path)
+
+    assert BdfFont.load(load_path, cache_dir=load_path.joinpath('cache')) == BdfFont.load(load_path)
+
+
+def test_cache_threads(assets_dir: Path, tmp_path: Path):
+    load_path = assets_dir.joinpath('misaki', 'misaki_gothic.bdf')
+    cache_dir = tmp_path.joinpath('cache')
+    with ThreadPoolExecutor(4) as executor:
+        fonts = list(executor.map(lambda _: BdfFont.load(load_path, cache_dir=cache_dir), range(8)))
+    assert all(font == fonts[0] for font in fonts)
+    assert len(list(cache_dir.iterdir())) == 1
+    assert BdfFont.load(load_path, cache_dir=cache_dir) == fonts[0]
+
+
+def test_lazy_edit(assets_dir: Path):
+    data = assets_dir.joinpath('demo.bdf').read_bytes()
+    font = BdfFont.parse_bytes(data, lazy=True)
+    glyph = font.glyphs[1]
+    assert glyph.encoding == 106
+    glyph.device_width = 10, 0
+    assert glyph.device_width == (10, 0)
+    assert glyph.scalable_width == (355, 0)
+    assert glyph.name == 'j'
+    assert '\nDWIDTH 10 0\n' in font.dump_to_string()
+
+
+def test_lazy_copy(assets_dir: Path):
+    file_path = assets_dir.joinpath('demo.bdf')
+    eager_font = BdfFont.load(file_path)
+    font = BdfFont.load(file_path, mmap=True, lazy=True)
+
+    glyph = copy.copy(font.glyphs[0])
+    assert type(glyph) is BdfGlyph
+    assert glyph == eager_font.glyphs[0]
+    assert copy.deepcopy(font) == eager_font
+    assert pickle.loads(pickle.dumps(font)) == eager_font
+    assert font == eager_font
+
+
+def test_lazy_save(assets_dir: Path, tmp_path: Path):
+    file_path = tmp_path.joinpath('misaki_gothic.bdf')
+    file_path.write_bytes(assets_dir.joinpath('misaki', 'misaki_gothic.bdf').read_bytes())
+    eager_font = BdfFont.load(file_path)
+    font = BdfFont.load(file_path, mmap=True, lazy=True)
+    for glyphs in eager_font.glyphs[100:110], font.glyphs[100:110]:
+        glyphs[0].device_width = 9, 0
+        glyphs[1].bitmap_data = bytes(len(glyphs[1].bitmap_data))
+        glyphs[2].bitmap[0][0] = 1
+        glyphs[3].comments.append('Edited.')
+    other_path = tmp_path.joinpath('other.bdf')
+    font.save(other_path)
+    assert other_path.read_bytes() == eager_font.dump_to_bytes()
+    assert isinstance(font.glyphs[200]._buffer, mmap.mmap)
+
+    font.save(file_path)
+    assert file_path.read_bytes() == eager_font.dump_to_bytes()
+    assert not any(isinstance(glyph._buffer, mmap.mmap) for glyph in font.glyphs if hasattr(glyph, '_buffer'))
+    assert font.glyphs[200].name == eager_font.glyphs[200].name
+    font.save(other_path)
+    assert other_path.read_bytes() == eager_font.dump_to_bytes()
+
+    new_path = tmp_path.joinpath('new.bdf')
+    BdfFont.load(other_path, lazy=True).save(new_path)
+    eager_font.save(tmp_path.joinpath('eager.bdf'))
+    assert new_path.stat().st_mode == tmp_path.joinpath('eager.bdf').stat().st_mode
+    os.chmod(other_path, 0o640)
+    BdfFont.load(other_path, lazy=True).save(other_path)
+    assert other_path.stat().st_mode & 0o777 == 0o640
+
+    data = assets_dir.joinpath('demo.bdf').read_bytes().replace(b'\nENCODING ', b'\nENCODING   ')
+    font = BdfFont.parse_bytes(data, lazy=True)
+    assert font.dump_to_bytes() == data
+    font.glyphs[0].device_width = font.glyphs[0].device_width
+    assert font.dump_to_bytes().count(b'\nENCODING   ') == len(font.glyphs) - 1
+
+    file_path.write_bytes(assets_dir.joinpath('demo.bdf').read_bytes().replace(b'\n', b'\r\n'))
+    font = BdfFont.load(file_path, lazy=True)
+    assert font.dump_to_bytes() == BdfFont.load(assets_dir.joinpath('demo.bdf')).dump_to_bytes()
@@ -2,7 +2,7 @@ from pathlib import Path
 
 import pytest
 
-from bdffont import BdfFont, BdfGlyph
+from bdffont import BdfFont, BdfGlyph, BdfStats, iter_glyphs
 from bdffont.error import BdfDumpError
 
 
@@ -10,6 +10,7 @@ def test_demo(assets_dir: Path):
     data = assets_dir.joinpath('demo.bdf').read_text('utf-8')
     font = BdfFont.parse(data)
     assert font.dump_to_string() == data
+    assert font.dump_to_bytes() == data.encode('utf-8')
 
     assert font.name == '-Adobe-Helvetica-Bold-R-Normal--24-240-75-75-P-65-ISO8859-1'
     assert font.point_size == 24
@@ -75,6 +76,80 @@ def test_demo(assets_dir: Path):
     assert glyph.comments == ['This is a comment in char.']
 
 
+def test_parse_bytes(assets_dir: Path):
+    data = assets_dir.joinpath('demo.bdf').read_bytes()
+    font = BdfFont.parse(data.decode('utf-8'))
+    assert BdfFont.parse_bytes(data) == font
+    assert BdfFont.parse_bytes(bytearray(data)) == font
+    assert BdfFont.parse_bytes(memoryview(data)) == font
+    assert BdfFont.parse_bytes(data.replace(b'\n', b'\r\n')) == font
+
+
+def test_line_breaks_and_whitespace(assets_dir: Path, tmp_path: Path):
+    file_path = assets_dir.joinpath('demo.bdf')
+    font = BdfFont.load(file_path)
+
+    data = file_path.read_bytes().replace(b'\n', b'\r')
+    assert BdfFont.parse_bytes(data) == font
+    assert BdfFont.parse_bytes(data, lazy=True).dump_to_bytes() == font.dump_to_bytes()
+    assert BdfFont.parse_bytes(data, lazy=True).dump_to_string() == font.dump_to_string()
+    file_path = tmp_path.joinpath('cr.bdf')
+    file_path.write_bytes(data)
+    assert BdfFont.load(file_path) == font
+    assert BdfFont.load(file_path, mmap=True) == font
+    assert BdfFont.load(file_path, mmap=True, lazy=True).dump_to_bytes() == font.dump_to_bytes()
+    assert BdfFont.load(file_path, lazy=True).dump_to_string() == font.dump_to_string()
+    with file_path.open('rb') as file:
+        assert list(iter_glyphs(file)) == font.glyphs
+
+    text = font.dump_to_string().replace('STARTFONT 2.1\n', 'STARTFONT 2.1\nCOMMENT x\u3000\n')
+    assert BdfFont.parse(text).comments[0] == 'x'
+    assert BdfFont.parse_bytes(text.encode('utf-8')).comments[0] == 'x'
+
+
+def test_stats(assets_dir: Path, tmp_path: Path):
+    file_path = assets_dir.joinpath('demo.bdf')
+    data = file_path.read_bytes()
+    lines_count = data.count(b'\n')
+
+    stats = BdfStats()
+    font = BdfFont.parse_bytes(data, stats=stats)
+    assert font == BdfFont.parse_bytes(data)
+    assert stats.counts == {
+        'parse.lines': lines_count,
+        'parse.bytes': len(data),
+        'parse.glyphs': len(font.glyphs),
+        'parse.bitmap_rows': sum(glyph.height for glyph in font.glyphs),
+    }
+    assert set(stats.seconds) == {'parse', 'parse.other', 'parse.properties', 'parse.glyphs', 'parse.bitmaps'}
+    assert all(seconds >= 0 for seconds in stats.seconds.values())
+
+    BdfFont.parse(data.decode('utf-8'), stats=stats)
+    assert stats.counts['parse.lines'] == lines_count * 2
+    assert stats.counts['parse.glyphs'] == len(font.glyphs) * 2
+
+    stats.clear()
+    BdfFont.parse_bytes(data, lazy=True, stats=stats)
+    assert stats.counts['parse.glyphs'] == len(font.glyphs)
+    assert stats.counts['parse.bitmap_rows'] == 0
+    assert stats.seconds['parse.bitmaps'] == 0
+
+    stats.clear()
+    assert BdfFont.load(file_path, stats=stats) == font
+    assert 'load.read' in stats.seconds
+    assert stats.counts['parse.bytes'] == len(data)
+
+    stats.clear()
+    assert font.dump_to_bytes(stats) == data
+    assert font.dump_to_string(stats) == data.decode('utf-8')
+    font.save(tmp_path.joinpath('demo.bdf'), stats)
+    assert tmp_path.joinpath('demo.bdf').read_bytes() == data
+    assert stats.counts['dump.lines'] == lines_count * 3
+    assert stats.counts['dump.bytes'] == len(data) * 3
+    assert stats.counts['dump.glyphs'] == len(font.glyphs) * 3
+    assert set(stats.seconds) == {'dump', 'dump.header', 'dump.glyphs', 'dump.write'}
+
+
 def test_multi_line():
     font = BdfFont()
     font.comments.append('Hello\nWorld')
@@ -103,3 +178,42 @@ def test_multi_line():
     with pytest.raises(BdfDumpError) as info:
         font.dump_to_string()
     assert info.value.args[0] == 'tail cannot be multi-line string'
+
+    font = BdfFont()
+    font.glyphs.append(BdfGlyph(
+        name='A\u2028B',
+        encoding=65,
+    ))
+    with pytest.raises(BdfDumpError) as info:
+        font.dump_to_string()
+    assert info.value.args[0] == 'tail cannot be multi-line string'
+
+
+def test_irregular_bitmap_rows():
+    font = BdfFont.parse('''STARTFONT 2.1
+FONT Irregular
+SIZE 16 75 75
+FONTBOUNDINGBOX 12 3 0 0
+STARTPROPERTIES 0
+ENDPROPERTIES
+CHARS 1
+STARTCHAR A
+ENCODING 65
+SWIDTH 500 0
+DWIDTH 12 0
+BBX 12 3 0 0
+BITMAP
+FFFF
+F
+ABCDEF
+ENDCHAR
+ENDFONT
+''')
+    glyph = font.glyphs[0]
+    assert glyph.bitmap_data == b'\xff\xf0\xf0\x00\xab\xc0'
+    assert glyph.bitmap == [
+        [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
+        [1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 0],
+        [1, 0, 1, 0, 1, 0, 1, 1, 1, 1, 0, 0],
+    ]
+    assert '\nBITMAP\nFFF0\nF000\nABC0\nENDCHAR\n' in font.dump_to_string()
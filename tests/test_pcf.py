@@ -0,0 +1,63 @@
+from pathlib import Path
+
+import pytest
+
+from bdffont import BdfFont, PcfReader
+from bdffont.error import BdfParseError
+
+
+def _assert_same_font(pcf_font: BdfFont, font: BdfFont):
+    assert pcf_font.name == font.name
+    assert pcf_font.point_size == font.point_size
+    assert pcf_font.resolution == font.resolution
+    assert pcf_font.bounding_box == font.bounding_box
+    assert dict(pcf_font.properties) == dict(font.properties)
+    assert len(pcf_font.glyphs) == len(font.glyphs)
+    for pcf_glyph, glyph in zip(pcf_font.glyphs, font.glyphs):
+        assert pcf_glyph.name == glyph.name
+        assert pcf_glyph.encoding == glyph.encoding
+        assert pcf_glyph.scalable_width_x == glyph.scalable_width_x
+        assert pcf_glyph.device_width_x == glyph.device_width_x
+        assert pcf_glyph.bounding_box == glyph.bounding_box
+        assert pcf_glyph.bitmap_data == glyph.bitmap_data
+
+
+def test_misaki_gothic(assets_dir: Path, tmp_path: Path):
+    font = BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic.bdf'))
+    for glyph_pad in [1, 2, 4, 8]:
+        for msb_first in [True, False]:
+            file_path = tmp_path.joinpath(f'misaki_gothic_{glyph_pad}_{msb_first}.pcf')
+            font.save_pcf(file_path, glyph_pad, msb_first)
+            _assert_same_font(BdfFont.load_pcf(file_path), font)
+
+
+def test_demo(assets_dir: Path, tmp_path: Path):
+    font = BdfFont.load(assets_dir.joinpath('demo.bdf'))
+    file_path = tmp_path.joinpath('demo.pcf')
+    font.save_pcf(file_path)
+    _assert_same_font(BdfFont.load_pcf(file_path), font)
+
+
+def test_reader(assets_dir: Path):
+    font = BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic.bdf'))
+    reader = PcfReader(font.dump_pcf_to_bytes())
+    assert reader.glyphs_count == len(font.glyphs)
+    assert reader.default_char == 3000
+    glyph = reader.get_glyph(0x3042)
+    assert glyph.name == 'uni3042'
+    assert glyph.bounding_box == (7, 7, 0, -1)
+    assert glyph.bitmap == font.get_glyph(0x3042).bitmap
+    assert reader.get_glyph(0x10FFFF) is None
+    assert reader.get_glyph(-1) is None
+
+    with pytest.raises(BdfParseError) as info:
+        PcfReader(assets_dir.joinpath('demo.bdf').read_bytes())
+    assert info.value.args[0] == 'not a pcf file'
+
+
+def test_truncated(assets_dir: Path):
+    data = BdfFont.load(assets_dir.joinpath('demo.bdf')).dump_pcf_to_bytes()
+    for size in range(4, len(data)):
+        with pytest.raises(BdfParseError) as info:
+            PcfReader(data[:size]).read_glyphs()
+        assert info.value.args[0] == 'truncated or damaged pcf file'
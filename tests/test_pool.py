@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from bdffont import BdfBitmapPool, BdfFont, BdfGlyph
+
+
+def test_pool(assets_dir: Path):
+    pool = BdfBitmapPool()
+    font_1 = BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic.bdf'), bitmap_pool=pool)
+    saved_bytes = pool.saved_bytes
+    assert saved_bytes > 0
+    assert len(pool) == len({glyph.bitmap_data for glyph in font_1.glyphs})
+
+    font_2 = BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic_2nd.bdf'), bitmap_pool=pool)
+    assert pool.saved_bytes > saved_bytes
+    assert font_2 == BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic_2nd.bdf'))
+
+    glyph_1, glyph_2 = next(
+        (glyph_1, glyph_2)
+        for glyph_1, glyph_2 in zip(font_1.glyphs, font_2.glyphs)
+        if glyph_1.bitmap_data == glyph_2.bitmap_data and any(glyph_1.bitmap_data)
+    )
+    assert glyph_1.bitmap_data is glyph_2.bitmap_data
+
+    glyph_1.bitmap[0][0] = 1 - glyph_1.bitmap[0][0]
+    assert glyph_1.bitmap_data != glyph_2.bitmap_data
+    assert glyph_2.bitmap_data in pool
+
+    with pytest.raises(ValueError) as info:
+        BdfFont.load(assets_dir.joinpath('demo.bdf'), lazy=True, bitmap_pool=pool)
+    assert info.value.args[0] == "'bitmap_pool' cannot be combined with 'lazy'"
+
+
+def test_intern():
+    pool = BdfBitmapPool()
+    glyphs = [
+        BdfGlyph(name=f'g{index}', encoding=index, bounding_box=(16, 2, 0, 0), bitmap_data=bytes([index % 2] * 4))
+        for index in range(4)
+    ]
+    pool.intern_glyphs(glyphs)
+    assert len(pool) == 2
+    assert glyphs[0].bitmap_data is glyphs[2].bitmap_data
+    assert glyphs[1].bitmap_data is glyphs[3].bitmap_data
+    assert pool.intern(bytes([1] * 4)) is glyphs[1].bitmap_data
+
+    pool.clear()
+    assert len(pool) == 0
+    assert glyphs[0].bitmap_data is glyphs[2].bitmap_data
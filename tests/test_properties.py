@@ -210,3 +210,68 @@ def test_properties_7():
     with pytest.raises(ValueError) as info:
         properties.family_name = 'Demo-Pixel'
     assert info.value.args[0] == "contains illegal characters '-'"
+
+
+def test_properties_8():
+    properties = BdfProperties()
+    properties.update_bulk({
+        'foundry': 'TakWolf Studio',
+        'PIXEL_SIZE': 16,
+        'abc': 'abc',
+    })
+    assert properties.foundry == 'TakWolf Studio'
+    assert properties.pixel_size == 16
+    assert properties['ABC'] == 'abc'
+
+    properties.update_bulk({
+        'abc': None,
+        'DEFAULT_CHAR': True,
+    })
+    assert 'ABC' not in properties
+    assert properties.default_char is True
+
+    with pytest.raises(KeyError) as info:
+        properties.update_bulk({'x_height': 5, 'abc-def': 'abcdef'})
+    assert info.value.args[0] == 'contains illegal characters'
+    assert properties.x_height is None
+
+    with pytest.raises(KeyError) as info:
+        properties.update_bulk({'__': 1})
+    assert info.value.args[0] == 'contains illegal characters'
+
+    with pytest.raises(ValueError) as info:
+        properties.update_bulk({'PIXEL_SIZE': '1'})
+    assert info.value.args[0] == "expected type 'int', got 'str' instead"
+
+    with pytest.raises(ValueError) as info:
+        properties.update_bulk({'FAMILY_NAME': 'Demo-Pixel'})
+    assert info.value.args[0] == "contains illegal characters '-'"
+
+    with pytest.raises(ValueError) as info:
+        properties.update_bulk({'spacing': 'a-b', 'Spacing': 'P'})
+    assert info.value.args[0] == "contains illegal characters '-'"
+    assert properties == BdfProperties({'FOUNDRY': 'TakWolf Studio', 'PIXEL_SIZE': 16, 'DEFAULT_CHAR': True})
+
+    properties.update_bulk({'spacing': 'C', 'Spacing': 'P'})
+    assert properties.spacing == 'P'
+
+
+def test_properties_9():
+    properties = BdfProperties.from_trusted({
+        'FOUNDRY': 'TakWolf Studio',
+        'PIXEL_SIZE': 16,
+    }, comments=['This is a comment.'])
+    assert properties.foundry == 'TakWolf Studio'
+    assert properties.pixel_size == 16
+    assert properties.comments == ['This is a comment.']
+    properties.validate()
+
+    properties = BdfProperties.from_trusted({'FAMILY_NAME': 'Demo-Pixel'})
+    with pytest.raises(ValueError) as info:
+        properties.validate()
+    assert info.value.args[0] == "contains illegal characters '-'"
+
+    properties = BdfProperties.from_trusted({'family_name': 'Demo Pixel'})
+    with pytest.raises(KeyError) as info:
+        properties.validate()
+    assert info.value.args[0] == 'contains lower case characters'
@@ -0,0 +1,58 @@
+from bdffont import BdfFont, BdfGlyph
+
+
+def _create_font() -> BdfFont:
+    font = BdfFont(bounding_box=(4, 4, 0, -1))
+    font.glyphs.append(BdfGlyph(
+        name='A',
+        encoding=65,
+        device_width=(3, 0),
+        bounding_box=(2, 3, 0, 0),
+        bitmap=[
+            [1, 1],
+            [1, 0],
+            [1, 1],
+        ],
+    ))
+    font.glyphs.append(BdfGlyph(
+        name='g',
+        encoding=103,
+        device_width=(2, 0),
+        bounding_box=(1, 2, 1, -1),
+        bitmap=[
+            [1],
+            [1],
+        ],
+    ))
+    return font
+
+
+def test_render_text():
+    font = _create_font()
+    assert font.measure_text('AgA') == (8, 4)
+    assert font.render_text('AgA') == [
+        [1, 1, 0, 0, 0, 1, 1, 0],
+        [1, 0, 0, 0, 0, 1, 0, 0],
+        [1, 1, 0, 0, 1, 1, 1, 0],
+        [0, 0, 0, 0, 1, 0, 0, 0],
+    ]
+    assert font.render_text('') == [[], [], [], []]
+
+
+def test_default_char():
+    font = _create_font()
+    assert font.measure_text('AxA') == (6, 4)
+    font.properties.default_char = 103
+    assert font.measure_text('AxA') == (8, 4)
+    assert font.render_text('AxA') == font.render_text('AgA')
+
+
+def test_cache():
+    font = _create_font()
+    font.text_renderer.cache_size = 1
+    assert font.measure_text('AgAg') == (10, 4)
+    font.glyphs[0] = BdfGlyph(name='A', encoding=65, device_width=(5, 0))
+    assert font.measure_text('A') == (5, 4)
+    font.glyphs[0].device_width = 6, 0
+    font.text_renderer.clear_cache()
+    assert font.measure_text('A') == (6, 4)
@@ -0,0 +1,112 @@
+from io import BytesIO, StringIO
+from pathlib import Path
+
+import pytest
+
+from bdffont import BdfFont, BdfGlyph, BdfWriter, iter_glyphs, load_header, subset
+from bdffont.error import BdfMissingWordError, BdfCountError, BdfDumpError
+
+
+def test_iter_glyphs(assets_dir: Path):
+    file_path = assets_dir.joinpath('misaki', 'misaki_gothic.bdf')
+    font = BdfFont.load(file_path)
+
+    glyphs = iter_glyphs(file_path)
+    header = glyphs.header
+    assert header.name == font.name
+    assert header.bounding_box == font.bounding_box
+    assert header.properties == font.properties
+    assert len(header.glyphs) == 0
+    assert list(glyphs) == font.glyphs
+    assert len(header.glyphs) == 0
+
+    with file_path.open('r', encoding='utf-8') as file:
+        assert list(iter_glyphs(file)) == font.glyphs
+    with file_path.open('rb') as file:
+        assert list(iter_glyphs(file)) == font.glyphs
+
+
+def test_load_header(assets_dir: Path):
+    header = load_header(assets_dir.joinpath('demo.bdf'))
+    assert header.name == '-Adobe-Helvetica-Bold-R-Normal--24-240-75-75-P-65-ISO8859-1'
+    assert header.resolution == (75, 75)
+    assert header.properties.font_ascent == 21
+    assert header.comments == ['This is a sample font in 2.1 format.']
+    assert len(header.glyphs) == 0
+
+
+def test_damaged(assets_dir: Path):
+    with pytest.raises(BdfMissingWordError) as info:
+        iter_glyphs(assets_dir.joinpath('damaged', 'no_line_font.bdf'))
+    assert info.value.word == 'FONT'
+
+    glyphs = iter_glyphs(assets_dir.joinpath('damaged', 'incorrect_chars_count.bdf'))
+    with pytest.raises(BdfCountError) as info:
+        for _ in glyphs:
+            pass
+    assert str(info.value) == "the count of 'CHARS' is incorrect: 1000 -> 2"
+
+
+def test_writer(assets_dir: Path, tmp_path: Path):
+    font = BdfFont.load(assets_dir.joinpath('misaki', 'misaki_gothic.bdf'))
+
+    file_path = tmp_path.joinpath('count.bdf')
+    with BdfWriter(file_path, font, len(font.glyphs)) as writer:
+        writer.write_glyphs(iter(font.glyphs))
+    assert file_path.read_bytes() == font.dump_to_bytes()
+
+    stream = BytesIO()
+    with BdfWriter(stream, font) as writer:
+        writer.write_glyphs(font.glyphs)
+    assert BdfFont.parse_bytes(stream.getvalue()) == font
+
+    stream = StringIO()
+    with BdfWriter(stream, font, len(font.glyphs)) as writer:
+        writer.write_glyphs(font.glyphs)
+    assert stream.getvalue() == font.dump_to_string()
+
+    file_path = tmp_path.joinpath('placeholder.bdf')
+    with BdfWriter(file_path, font) as writer:
+        for glyph in iter_glyphs(assets_dir.joinpath('misaki', 'misaki_gothic.bdf')):
+            writer.write_glyph(glyph)
+    assert f'\nCHARS {len(font.glyphs)}      \n' in file_path.read_text('utf-8')
+    assert BdfFont.load(file_path) == font
+
+
+def test_writer_count():
+    stream = StringIO()
+    with pytest.raises(BdfDumpError) as info:
+        with BdfWriter(stream, BdfFont(), 2) as writer:
+            writer.write_glyph(BdfGlyph(name='A', encoding=65))
+    assert info.value.args[0] == 'expected 2 glyphs, written 1'
+
+
+def test_subset(assets_dir: Path, tmp_path: Path):
+    source_path = assets_dir.joinpath('misaki', 'misaki_gothic.bdf')
+    font = BdfFont.load(source_path)
+
+    font.glyphs = [
+        glyph for glyph in font.glyphs
+        if 0x20 <= glyph.encoding < 0x7F or 0x3040 <= glyph.encoding < 0x30A0 or glyph.encoding == 0x4E00
+    ]
+    file_path = tmp_path.joinpath('subset.bdf')
+    assert subset(source_path, file_path, [range(0x20, 0x7F), range(0x3040, 0x30A0), 0x4E00]) == len(font.glyphs)
+    assert BdfFont.load(file_path) == font
+    assert f'\nCHARS {len(font.glyphs):<10}\n' in file_path.read_text('utf-8')
+    assert subset(source_path, file_path, {range(0x20, 0x7F), range(0x3040, 0x30A0), 0x4E00}) == len(font.glyphs)
+    assert BdfFont.load(file_path) == font
+    assert subset(source_path, file_path, frozenset(glyph.encoding for glyph in font.glyphs)) == len(font.glyphs)
+    assert BdfFont.load(file_path) == font
+
+    assert subset(file_path, file_path, {0x41, 0x42}) == 2
+    assert [glyph.encoding for glyph in BdfFont.load(file_path).glyphs] == [0x41, 0x42]
+
+    stream = BytesIO()
+    assert subset(assets_dir.joinpath('demo.bdf'), stream, range(0)) == 0
+    subset_font = BdfFont.parse_bytes(stream.getvalue())
+    assert subset_font.properties == BdfFont.load(assets_dir.joinpath('demo.bdf')).properties
+    assert len(subset_font.glyphs) == 0
+
+    with pytest.raises(BdfCountError):
+        subset(assets_dir.joinpath('damaged', 'incorrect_chars_count.bdf'), file_path, range(0x100))
+    assert [glyph.encoding for glyph in BdfFont.load(file_path).glyphs] == [0x41, 0x42]